@@ -1,15 +1,51 @@
 import os
+from collections import ChainMap
+from dataclasses import dataclass, field
+from pathlib import Path
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Snapshot the environment once and fall back to defaults for unset keys
+_env = dict(os.environ)
+_defaults = {
+    "MONGODB_URL": "mongodb://localhost:27017",
+    "DATABASE_NAME": "travel_guide_db",
+    "LLAMA_MODEL": "meta-llama/llama-3.2-3b-instruct:free",
+    "LLAMA_API_KEY": "",
+    "OPENWEATHER_API_KEY": "",
+    "HOST": "0.0.0.0",
+    "PORT": "8000",
+    "DEBUG": "False",
+    "LOG_LEVEL": "WARNING",
+    "ALLOWED_ORIGINS": "http://localhost:3000",
+    "LLM_CACHE_DIR": ".llm_cache",
+    "STREAM_MIN_BATCH": "4",
+    "STREAM_MAX_BATCH": "32",
+    "STREAM_BATCH_GROWTH": "2.0",
+    "STREAM_FLUSH_INTERVAL": "0.05",
+}
+_cfg = ChainMap(_env, _defaults)
 
+# Relative paths in settings are resolved against the backend directory,
+# not the process's working directory
+_BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# CORS origins are parsed once at import
+_ALLOWED_ORIGINS = tuple(
+    origin.strip()
+    for origin in _cfg["ALLOWED_ORIGINS"].split(",")
+    if origin.strip()
+)
+
+
+@dataclass(frozen=True, slots=True)
 class Settings:
     """Application settings"""
     
     # MongoDB Configuration
-    MONGODB_URL: str = os.getenv("MONGODB_URL", "mongodb://localhost:27017")
-    DATABASE_NAME: str = os.getenv("DATABASE_NAME", "travel_guide_db")
+    MONGODB_URL: str = _cfg["MONGODB_URL"]
+    DATABASE_NAME: str = _cfg["DATABASE_NAME"]
     
     # Collection names
     ITINERARY_COLLECTION: str = "itineraries"
@@ -17,24 +53,33 @@ class Settings:
     
     # AI Model Configuration (Llama via OpenRouter)
     AI_PROVIDER: str = "llama"
-    LLAMA_MODEL: str = os.getenv("LLAMA_MODEL", "meta-llama/llama-3.2-3b-instruct:free")
-    LLAMA_API_KEY: str = os.getenv("LLAMA_API_KEY", "")
+    LLAMA_MODEL: str = _cfg["LLAMA_MODEL"]
+    # Smaller model for short tasks (travel tips); defaults to LLAMA_MODEL
+    LLAMA_MODEL_FAST: str = _cfg.get("LLAMA_MODEL_FAST") or _cfg["LLAMA_MODEL"]
+    LLAMA_API_KEY: str = field(default=_cfg["LLAMA_API_KEY"], repr=False)
     LLAMA_BASE_URL: str = "https://openrouter.ai/api/v1"  # OpenRouter API endpoint
+    LLM_CACHE_DIR: str = str(_BACKEND_DIR / _cfg["LLM_CACHE_DIR"])  # on-disk cache of AI responses
+    
+    # Streaming: token deltas are coalesced into batches that start at
+    # STREAM_MIN_BATCH and grow by STREAM_BATCH_GROWTH up to STREAM_MAX_BATCH,
+    # flushing early once STREAM_FLUSH_INTERVAL seconds have passed
+    STREAM_MIN_BATCH: int = int(_cfg["STREAM_MIN_BATCH"])
+    STREAM_MAX_BATCH: int = int(_cfg["STREAM_MAX_BATCH"])
+    STREAM_BATCH_GROWTH: float = float(_cfg["STREAM_BATCH_GROWTH"])
+    STREAM_FLUSH_INTERVAL: float = float(_cfg["STREAM_FLUSH_INTERVAL"])
     
     # Weather API Configuration
-    OPENWEATHER_API_KEY: str = os.getenv("OPENWEATHER_API_KEY", "")
+    OPENWEATHER_API_KEY: str = field(default=_cfg["OPENWEATHER_API_KEY"], repr=False)
     
     # Server Configuration
-    HOST: str = os.getenv("HOST", "0.0.0.0")
-    PORT: int = int(os.getenv("PORT", 8000))
-    DEBUG: bool = os.getenv("DEBUG", "False").lower() == "true"
+    HOST: str = _cfg["HOST"]
+    PORT: int = int(_cfg["PORT"])
+    DEBUG: bool = _cfg["DEBUG"].lower() == "true"
+    LOG_LEVEL: str = _cfg["LOG_LEVEL"].upper()  # used when DEBUG is off
     
     # CORS Configuration
-    ALLOWED_ORIGINS: list = [
-        origin.strip() 
-        for origin in os.getenv("ALLOWED_ORIGINS", "http://localhost:3000").split(",")
-        if origin.strip()
-    ]
+    ALLOWED_ORIGINS: tuple = _ALLOWED_ORIGINS
+    ALLOWED_ORIGINS_DISPLAY: str = ", ".join(_ALLOWED_ORIGINS)
     
     # Validation
     def validate(self) -> bool:
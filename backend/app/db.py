@@ -1,6 +1,9 @@
-from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase, AsyncIOMotorCollection
+from pymongo import ASCENDING, DESCENDING, IndexModel
 from pymongo.errors import ConnectionFailure
 from app.config import settings
+from functools import lru_cache
+import asyncio
 import logging
 
 logger = logging.getLogger(__name__)
@@ -8,6 +11,7 @@ logger = logging.getLogger(__name__)
 class Database:
     client: AsyncIOMotorClient = None
     db: AsyncIOMotorDatabase = None
+    index_task: asyncio.Task = None
 
 db = Database()
 
@@ -16,13 +20,14 @@ async def connect_to_mongo():
     try:
         db.client = AsyncIOMotorClient(settings.MONGODB_URL)
         db.db = db.client[settings.DATABASE_NAME]
+        get_collection.cache_clear()
         
         # Test connection
         await db.client.admin.command('ping')
         logger.info(f"✅ Connected to MongoDB: {settings.DATABASE_NAME}")
         
-        # Create indexes
-        await create_indexes()
+        # Create indexes in the background so startup doesn't wait on them
+        db.index_task = asyncio.create_task(create_indexes())
         
     except ConnectionFailure as e:
         logger.error(f"❌ Failed to connect to MongoDB: {e}")
@@ -30,20 +35,42 @@ async def connect_to_mongo():
 
 async def close_mongo_connection():
     """Close MongoDB connection"""
+    if db.index_task and not db.index_task.done():
+        db.index_task.cancel()
+    
     if db.client:
         db.client.close()
+        get_collection.cache_clear()
         logger.info("✅ MongoDB connection closed")
 
 async def create_indexes():
     """Create database indexes for better performance"""
     try:
-        # Itineraries indexes
-        await db.db[settings.ITINERARY_COLLECTION].create_index("destination")
-        await db.db[settings.ITINERARY_COLLECTION].create_index("created_at")
-        
-        # Suggestions indexes
-        await db.db[settings.SUGGESTIONS_COLLECTION].create_index("destination")
-        await db.db[settings.SUGGESTIONS_COLLECTION].create_index("category")
+        await asyncio.gather(
+            # Itineraries indexes
+            db.db[settings.ITINERARY_COLLECTION].create_index("destination"),
+            db.db[settings.ITINERARY_COLLECTION].create_index("created_at"),
+            
+            # Suggestions indexes: one per filter shape used by get_suggestions,
+            # each ending in the (rating, _id) sort so pages come off the index
+            db.db[settings.SUGGESTIONS_COLLECTION].create_indexes([
+                IndexModel("destination"),
+                IndexModel([("rating", DESCENDING), ("_id", ASCENDING)]),
+                IndexModel([("is_featured", ASCENDING), ("rating", DESCENDING), ("_id", ASCENDING)]),
+                IndexModel([("category", ASCENDING), ("rating", DESCENDING), ("_id", ASCENDING)]),
+                IndexModel([("budget", ASCENDING), ("rating", DESCENDING), ("_id", ASCENDING)]),
+                IndexModel([("continent", ASCENDING), ("rating", DESCENDING), ("_id", ASCENDING)]),
+                IndexModel([("duration_days", ASCENDING), ("rating", DESCENDING), ("_id", ASCENDING)]),
+                IndexModel([
+                    ("is_featured", ASCENDING),
+                    ("category", ASCENDING),
+                    ("budget", ASCENDING),
+                    ("continent", ASCENDING),
+                    ("duration_days", ASCENDING),
+                    ("rating", DESCENDING)
+                ])
+            ])
+        )
         
         logger.info("✅ Database indexes created")
     except Exception as e:
@@ -51,4 +78,9 @@ async def create_indexes():
 
 def get_database() -> AsyncIOMotorDatabase:
     """Get database instance"""
-    return db.db
\ No newline at end of file
+    return db.db
+
+@lru_cache(maxsize=None)
+def get_collection(name: str) -> AsyncIOMotorCollection:
+    """Get a cached collection handle"""
+    return db.db[name]
\ No newline at end of file
@@ -1,8 +1,9 @@
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from contextlib import asynccontextmanager
 import logging
+import sys
 import time
 
 from app.config import settings
@@ -16,25 +17,50 @@ setup_logging()
 logger = logging.getLogger(__name__)
 
 
+def log_startup_banner():
+    """Display startup message"""
+    logger.info("=" * 60)
+    logger.info("🌟 AI TRAVEL GUIDE API")
+    logger.info("=" * 60)
+    logger.info("📍 Server: http://%s:%s", settings.HOST, settings.PORT)
+    logger.info("📚 Docs: http://%s:%s/docs", settings.HOST, settings.PORT)
+    logger.info("🤖 AI Model: %s", settings.LLAMA_MODEL)
+    logger.info("🗄️  Database: %s", settings.DATABASE_NAME)
+    logger.info("🐛 Debug Mode: %s", settings.DEBUG)
+    logger.info("🌐 CORS Origins: %s", settings.ALLOWED_ORIGINS_DISPLAY)
+    logger.info("=" * 60)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Startup and shutdown events"""
     # Startup
     logger.info("🚀 Starting AI Travel Guide API...")
-    logger.info(f"📊 Configuration: Provider={settings.AI_PROVIDER}, Model={settings.LLAMA_MODEL}")
+    logger.info("📊 Configuration: Provider=%s, Model=%s", settings.AI_PROVIDER, settings.LLAMA_MODEL)
     
     try:
         await connect_to_mongo()
         logger.info("✅ Application started successfully")
     except Exception as e:
-        logger.error(f"❌ Failed to start application: {e}")
+        logger.error("❌ Failed to start application: %s", e)
         raise
     
+    if settings.DEBUG:
+        log_startup_banner()
+    
     yield
     
     # Shutdown
     logger.info("🛑 Shutting down...")
     await close_mongo_connection()
+    
+    from app.services.weather_service import weather_service
+    await weather_service.aclose()
+    
+    # Only close the AI service if something imported (and built) it
+    ai_module = sys.modules.get("app.services.ai_service")
+    if ai_module is not None:
+        await ai_module.ai_service.aclose()
     logger.info("✅ Application shutdown complete")
 
 
@@ -45,33 +71,16 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
-# CORS middleware - FIXED VERSION
-# Parse ALLOWED_ORIGINS from settings (handles both string and list)
-allowed_origins = []
-if isinstance(settings.ALLOWED_ORIGINS, str):
-    # Split comma-separated string and strip whitespace
-    allowed_origins = [origin.strip() for origin in settings.ALLOWED_ORIGINS.split(",")]
-elif isinstance(settings.ALLOWED_ORIGINS, list):
-    allowed_origins = settings.ALLOWED_ORIGINS
-else:
-    # Default fallback origins
-    allowed_origins = [
-        "http://localhost:3000",
-        "http://localhost:3001",
-        "http://localhost:5173",
-        "http://127.0.0.1:3000",
-        "http://127.0.0.1:3001",
-        "http://127.0.0.1:5173",
-    ]
-
-logger.info(f"🌐 CORS enabled for origins: {allowed_origins}")
+# CORS middleware
+logger.info("🌐 CORS enabled for origins: %s", settings.ALLOWED_ORIGINS_DISPLAY)
 
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=allowed_origins,
+    allow_origins=settings.ALLOWED_ORIGINS,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
@@ -79,23 +88,23 @@ app.add_middleware(
 )
 
 
-# Request timing middleware
-@app.middleware("http")
-async def add_process_time_header(request: Request, call_next):
-    """Add processing time to response headers"""
-    start_time = time.time()
-    response = await call_next(request)
-    process_time = time.time() - start_time
-    response.headers["X-Process-Time"] = str(round(process_time, 3))
-    return response
+# Request timing middleware (debug only)
+if settings.DEBUG:
+    @app.middleware("http")
+    async def add_process_time_header(request: Request, call_next):
+        """Add processing time (seconds) to response headers"""
+        start_ns = time.perf_counter_ns()
+        response = await call_next(request)
+        response.headers["X-Process-Time"] = f"{(time.perf_counter_ns() - start_ns) / 1e9:.3f}"
+        return response
 
 
 # Global exception handler
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     """Handle all unhandled exceptions"""
-    logger.error(f"❌ Unhandled exception: {exc}", exc_info=True)
-    return JSONResponse(
+    logger.error("❌ Unhandled exception: %s", exc, exc_info=True)
+    return ORJSONResponse(
         status_code=500,
         content={
             "detail": "Internal server error occurred",
@@ -160,7 +169,7 @@ async def health_check():
             await db.client.admin.command('ping')
             db_status = "connected"
     except Exception as e:
-        logger.error(f"Database health check failed: {e}")
+        logger.error("Database health check failed: %s", e)
     
     return {
         "status": "healthy",
@@ -182,7 +191,7 @@ async def health_check():
             "debug": settings.DEBUG
         },
         "cors": {
-            "allowed_origins": allowed_origins
+            "allowed_origins": settings.ALLOWED_ORIGINS
         }
     }
 
@@ -192,14 +201,12 @@ async def api_info():
     """
     Get API information and statistics
     """
-    from app.db import get_database
+    from app.db import get_collection
     
     try:
-        db = get_database()
-        
         # Get collection statistics
-        itinerary_count = await db[settings.ITINERARY_COLLECTION].count_documents({})
-        suggestion_count = await db[settings.SUGGESTIONS_COLLECTION].count_documents({})
+        itinerary_count = await get_collection(settings.ITINERARY_COLLECTION).count_documents({})
+        suggestion_count = await get_collection(settings.SUGGESTIONS_COLLECTION).count_documents({})
         
         return {
             "api_version": "1.0.0",
@@ -216,7 +223,7 @@ async def api_info():
             }
         }
     except Exception as e:
-        logger.error(f"Error fetching API info: {e}")
+        logger.error("Error fetching API info: %s", e)
         return {
             "api_version": "1.0.0",
             "ai_model": settings.LLAMA_MODEL,
@@ -224,26 +231,10 @@ async def api_info():
         }
 
 
-# Startup message
-@app.on_event("startup")
-async def startup_message():
-    """Display startup message"""
-    logger.info("=" * 60)
-    logger.info("🌟 AI TRAVEL GUIDE API")
-    logger.info("=" * 60)
-    logger.info(f"📍 Server: http://{settings.HOST}:{settings.PORT}")
-    logger.info(f"📚 Docs: http://{settings.HOST}:{settings.PORT}/docs")
-    logger.info(f"🤖 AI Model: {settings.LLAMA_MODEL}")
-    logger.info(f"🗄️  Database: {settings.DATABASE_NAME}")
-    logger.info(f"🐛 Debug Mode: {settings.DEBUG}")
-    logger.info(f"🌐 CORS Origins: {', '.join(allowed_origins)}")
-    logger.info("=" * 60)
-
-
 if __name__ == "__main__":
     import uvicorn
     
-    logger.info(f"🌟 Starting server on {settings.HOST}:{settings.PORT}")
+    logger.info("🌟 Starting server on %s:%s", settings.HOST, settings.PORT)
     uvicorn.run(
         "app.main:app",
         host=settings.HOST,
@@ -1,23 +1,13 @@
-from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
-from datetime import datetime
-from bson import ObjectId
+from pydantic import BaseModel, BeforeValidator, ConfigDict, Field
+from typing import Annotated, List, Optional, Dict, Any
+from datetime import datetime, timezone
+from functools import partial
 
-class PyObjectId(ObjectId):
-    """Custom ObjectId type for Pydantic"""
-    @classmethod
-    def __get_validators__(cls):
-        yield cls.validate
+# Bound once; used as the default factory for every timestamp field
+_utcnow = partial(datetime.now, timezone.utc)
 
-    @classmethod
-    def validate(cls, v):
-        if not ObjectId.is_valid(v):
-            raise ValueError("Invalid ObjectId")
-        return ObjectId(v)
-
-    @classmethod
-    def __get_pydantic_json_schema__(cls, field_schema):
-        field_schema.update(type="string")
+# Mongo _id exposed as a plain string on responses
+ObjectIdStr = Annotated[Optional[str], BeforeValidator(lambda v: str(v) if v else None)]
 
 
 # Request Models
@@ -31,8 +21,8 @@ class ItineraryRequest(BaseModel):
     start_date: Optional[str] = None
     additional_preferences: Optional[str] = None
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "destination": "Paris, France",
                 "days": 5,
@@ -43,6 +33,7 @@ class ItineraryRequest(BaseModel):
                 "additional_preferences": "Prefer walking tours"
             }
         }
+    )
 
 
 class DayPlan(BaseModel):
@@ -60,7 +51,7 @@ class DayPlan(BaseModel):
 # Response Models
 class ItineraryResponse(BaseModel):
     """Generated itinerary response"""
-    id: Optional[str] = Field(default=None, alias="_id")
+    id: ObjectIdStr = Field(default=None, alias="_id")
     destination: str
     days: int
     content: str  # Full markdown content
@@ -68,13 +59,10 @@ class ItineraryResponse(BaseModel):
     weather_info: Optional[Dict[str, Any]] = None
     budget_estimate: Optional[str] = None
     travel_tips: Optional[List[str]] = []
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=_utcnow)
     interests: List[str] = []
     
-    class Config:
-        populate_by_name = True
-        arbitrary_types_allowed = True
-        json_encoders = {ObjectId: str}
+    model_config = ConfigDict(populate_by_name=True)
 
 
 class StreamChunk(BaseModel):
@@ -97,9 +85,5 @@ class ItineraryDB(BaseModel):
     weather_info: Optional[Dict[str, Any]] = None
     budget_estimate: Optional[str] = None
     travel_tips: List[str] = []
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=_utcnow)
     user_preferences: Optional[str] = None
-    
-    class Config:
-        arbitrary_types_allowed = True
-        json_encoders = {ObjectId: str}
\ No newline at end of file
@@ -1,23 +1,18 @@
-from pydantic import BaseModel, Field, HttpUrl
-from typing import List, Optional, Dict, Any
-from datetime import datetime
-from bson import ObjectId
+from pydantic import BaseModel, BeforeValidator, ConfigDict, Field, HttpUrl
+from typing import Annotated, List, Mapping, Optional, Dict, Any
+from datetime import datetime, timezone
+from functools import partial
 
-class PyObjectId(ObjectId):
-    """Custom ObjectId type for Pydantic"""
-    @classmethod
-    def __get_validators__(cls):
-        yield cls.validate
+# Bound once; used as the default factory for every timestamp field
+_utcnow = partial(datetime.now, timezone.utc)
 
-    @classmethod
-    def validate(cls, v):
-        if not ObjectId.is_valid(v):
-            raise ValueError("Invalid ObjectId")
-        return ObjectId(v)
+# Mongo _id exposed as a plain string on responses
+ObjectIdStr = Annotated[Optional[str], BeforeValidator(lambda v: str(v) if v else None)]
 
-    @classmethod
-    def __get_pydantic_json_schema__(cls, field_schema):
-        field_schema.update(type="string")
+# Stored documents at this version are already normalized (array fields are
+# lists, duration_days is an int) and passed SuggestedTripDB validation.
+# Version 2 rows were stamped without validation, so they are read as legacy.
+SUGGESTION_SCHEMA_VERSION = 3
 
 
 # Request Models
@@ -35,7 +30,7 @@ class SuggestionFilterRequest(BaseModel):
 # Response Models
 class SuggestedTrip(BaseModel):
     """Single suggested trip"""
-    id: Optional[str] = Field(default=None, alias="_id")
+    id: ObjectIdStr = Field(default=None, alias="_id")
     destination: str
     country: str
     continent: Optional[str] = None
@@ -54,13 +49,11 @@ class SuggestedTrip(BaseModel):
     popular_activities: List[str] = []
     travel_tips: List[str] = []
     weather_info: Optional[str] = None
-    created_at: datetime = Field(default_factory=datetime.utcnow)
+    created_at: datetime = Field(default_factory=_utcnow)
     
-    class Config:
-        populate_by_name = True
-        arbitrary_types_allowed = True
-        json_encoders = {ObjectId: str}
-        json_schema_extra = {
+    model_config = ConfigDict(
+        populate_by_name=True,
+        json_schema_extra={
             "example": {
                 "destination": "Bali",
                 "country": "Indonesia",
@@ -78,13 +71,15 @@ class SuggestedTrip(BaseModel):
                 "rating": 4.8
             }
         }
+    )
 
 
 class SuggestionsResponse(BaseModel):
     """List of suggested trips"""
     total: int
     suggestions: List[SuggestedTrip]
-    filters_applied: Optional[Dict[str, Any]] = None
+    filters_applied: Optional[Mapping[str, Any]] = None  # read-only snapshot of the query
+    next_cursor: Optional[Dict[str, Any]] = None  # {"after_rating", "after_id", "after_unrated"}
 
 
 # Database Models
@@ -104,17 +99,14 @@ class SuggestedTripDB(BaseModel):
     budget: str
     estimated_cost: str
     image_url: Optional[str] = None
-    rating: Optional[float] = None
+    rating: Optional[float] = Field(default=None, ge=0, le=5)
     popular_activities: List[str] = []
     travel_tips: List[str] = []
     weather_info: Optional[str] = None
     is_featured: bool = False
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
-    
-    class Config:
-        arbitrary_types_allowed = True
-        json_encoders = {ObjectId: str}
+    created_at: datetime = Field(default_factory=_utcnow)
+    updated_at: datetime = Field(default_factory=_utcnow)
+    schema_version: int = SUGGESTION_SCHEMA_VERSION
 
 
 # Create Suggestion Request (for admin/seeding)
@@ -134,6 +126,6 @@ class CreateSuggestionRequest(BaseModel):
     budget: str
     estimated_cost: str
     image_url: Optional[str] = None
-    rating: Optional[float] = None
+    rating: Optional[float] = Field(default=None, ge=0, le=5)
     popular_activities: List[str] = []
     travel_tips: List[str] = []
\ No newline at end of file
@@ -3,12 +3,9 @@ from fastapi.responses import StreamingResponse
 from app.models.itinerary_model import (
     ItineraryRequest, 
     ItineraryResponse, 
-    ItineraryDB,
     StreamChunk
 )
-from app.services.ai_service import ai_service
-from app.services.weather_service import weather_service
-from app.db import get_database
+from app.db import get_collection
 from app.config import settings
 from app.utils.helpers import (
     extract_city_from_destination,
@@ -18,13 +15,41 @@ from app.utils.helpers import (
 )
 from typing import List
 import logging
-import json
-from datetime import datetime
+import asyncio
+import orjson
+from datetime import datetime, timezone
 from bson import ObjectId
+from bson.errors import InvalidId
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# Heavy fields left out of summary listings
+SUMMARY_PROJECTION = {"content": 0, "day_plans": 0}
+
+
+def sse_event(chunk: StreamChunk) -> bytes:
+    """Encode a stream chunk as a ready-to-send SSE frame"""
+    return b"data: %b\n\n" % orjson.dumps(chunk.model_dump())
+
+
+# Strong references to in-flight background writes
+_background_writes = set()
+
+
+def _on_write_done(task: asyncio.Task) -> None:
+    """Release a finished write and log failures"""
+    _background_writes.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("❌ Background itinerary write failed: %s", task.exception())
+
+
+def save_in_background(write) -> None:
+    """Run a DB write without blocking the response"""
+    task = asyncio.create_task(write)
+    _background_writes.add(task)
+    task.add_done_callback(_on_write_done)
+
 
 @router.post("/generate", response_model=ItineraryResponse, status_code=status.HTTP_201_CREATED)
 async def generate_itinerary(request: ItineraryRequest):
@@ -40,64 +65,70 @@ async def generate_itinerary(request: ItineraryRequest):
     - Travel tips
     - Budget estimates
     """
+    # Services pull in the OpenAI SDK / httpx; import on first use
+    from app.services.ai_service import ai_service
+    from app.services.weather_service import weather_service
+    
     try:
-        logger.info(f"📍 Generating itinerary for {request.destination}")
+        logger.info("📍 Generating itinerary for %s", request.destination)
         
         destination = sanitize_destination_name(request.destination)
         
-        # Generate itinerary using AI
-        content = await ai_service.generate_itinerary(request)
+        city = extract_city_from_destination(destination)
         
-        # Get weather information (OpenWeatherMap API integration)
-        weather_info = None
-        try:
-            city = extract_city_from_destination(destination)
-            weather_info = await weather_service.get_current_weather(city)
-        except Exception as e:
-            logger.warning(f"⚠️ Could not fetch weather: {e}")
+        # Itinerary, weather (OpenWeatherMap API integration) and tips hit
+        # independent upstream services, so run them concurrently
+        content, weather_info, travel_tips = await asyncio.gather(
+            ai_service.generate_itinerary(request),
+            weather_service.get_current_weather(city),
+            ai_service.generate_travel_tips(destination),
+            return_exceptions=True
+        )
         
-        # Generate travel tips
-        travel_tips = await ai_service.generate_travel_tips(destination)
+        if isinstance(content, Exception):
+            raise content
+        
+        if isinstance(weather_info, Exception):
+            logger.warning("⚠️ Could not fetch weather: %s", weather_info)
+            weather_info = None
+        
+        if isinstance(travel_tips, Exception):
+            logger.warning("⚠️ Could not generate travel tips: %s", travel_tips)
+            travel_tips = []
         
         # Calculate estimated cost
         budget_estimate = calculate_estimated_cost(request.days, request.budget, request.travelers)
         
-        # Save to database
-        db = get_database()
-        itinerary_data = ItineraryDB(
-            destination=destination,
-            days=request.days,
-            interests=request.interests,
-            budget=request.budget,
-            travelers=request.travelers,
-            content=content,
-            weather_info=weather_info,
-            travel_tips=travel_tips,
-            budget_estimate=budget_estimate,
-            user_preferences=request.additional_preferences
-        )
+        # Save to database (same shape as ItineraryDB, built once)
+        itinerary_id = ObjectId()
+        itinerary_doc = {
+            "_id": itinerary_id,
+            "destination": destination,
+            "days": request.days,
+            "interests": request.interests,
+            "budget": request.budget,
+            "travelers": request.travelers,
+            "content": content,
+            "day_plans": [],
+            "weather_info": weather_info,
+            "budget_estimate": budget_estimate,
+            "travel_tips": travel_tips,
+            "created_at": datetime.now(timezone.utc),
+            "user_preferences": request.additional_preferences
+        }
         
-        result = await db[settings.ITINERARY_COLLECTION].insert_one(
-            itinerary_data.model_dump(exclude={'id'})
-        )
+        # Persist in the background; the id is generated client-side so the
+        # response doesn't have to wait for the write
+        save_in_background(get_collection(settings.ITINERARY_COLLECTION).insert_one(itinerary_doc))
         
-        response = ItineraryResponse(
-            _id=str(result.inserted_id),
-            destination=destination,
-            days=request.days,
-            content=content,
-            weather_info=weather_info,
-            travel_tips=travel_tips,
-            budget_estimate=budget_estimate,
-            interests=request.interests,
-            created_at=datetime.utcnow()
-        )
+        # Document is trusted (we just built it), so skip re-validation
+        response = ItineraryResponse.model_construct(**{**itinerary_doc, "_id": str(itinerary_id)})
         
-        logger.info(f"✅ Itinerary created with ID: {result.inserted_id}")
+        logger.info("✅ Itinerary created with ID: %s", itinerary_id)
         return response
         
     except Exception as e:
-        logger.error(f"❌ Error generating itinerary: {e}")
+        logger.error("❌ Error generating itinerary: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to generate itinerary: {str(e)}"
@@ -112,22 +143,23 @@ async def generate_itinerary_stream(request: ItineraryRequest):
     Returns Server-Sent Events (SSE) stream showing AI thinking process
     in real-time. Shows how AI is generating or refining itinerary ideas.
     """
+    from app.services.ai_service import ai_service
+    
     async def event_generator():
         try:
-            logger.info(f"🌊 Streaming itinerary for {request.destination}")
+            logger.info("🌊 Streaming itinerary for %s", request.destination)
             
             async for chunk in ai_service.generate_itinerary_stream(request):
-                data = json.dumps(chunk.model_dump())
-                yield f"data: {data}\n\n"
+                yield sse_event(chunk)
             
         except Exception as e:
-            logger.error(f"❌ Streaming error: {e}")
+            logger.error("❌ Streaming error: %s", e)
             error_chunk = StreamChunk(
                 type="error",
                 content=str(e),
                 metadata={"error": str(e)}
             )
-            yield f"data: {json.dumps(error_chunk.model_dump())}\n\n"
+            yield sse_event(error_chunk)
     
     return StreamingResponse(
         event_generator(),
@@ -136,26 +168,27 @@ async def generate_itinerary_stream(request: ItineraryRequest):
 
 
 @router.get("/", response_model=List[ItineraryResponse])
-async def get_itineraries(limit: int = 10, skip: int = 0, itinerary_id: str = None):
+async def get_itineraries(limit: int = 10, skip: int = 0, itinerary_id: str = None, full: bool = True):
     """
     🎯 ROUTE 3: Get all itineraries or specific itinerary by ID
     
     If itinerary_id provided: Returns specific itinerary
     Otherwise: Returns all saved itineraries with pagination
+    (full=false skips the markdown content and day plans in the list)
     """
     try:
-        db = get_database()
-        
         # If ID provided, return specific itinerary
         if itinerary_id:
-            if not ObjectId.is_valid(itinerary_id):
+            try:
+                oid = ObjectId(itinerary_id)
+            except (InvalidId, TypeError):
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail="Invalid itinerary ID format"
                 )
             
-            itinerary = await db[settings.ITINERARY_COLLECTION].find_one(
-                {"_id": ObjectId(itinerary_id)}
+            itinerary = await get_collection(settings.ITINERARY_COLLECTION).find_one(
+                {"_id": oid}
             )
             
             if not itinerary:
@@ -165,24 +198,36 @@ async def get_itineraries(limit: int = 10, skip: int = 0, itinerary_id: str = No
                 )
             
             itinerary['_id'] = str(itinerary['_id'])
-            return [ItineraryResponse(**itinerary)]
+            return [ItineraryResponse.model_construct(**itinerary)]
         
         # Otherwise return all with pagination
-        cursor = db[settings.ITINERARY_COLLECTION].find().sort("created_at", -1).skip(skip).limit(limit)
+        cursor = (
+            get_collection(settings.ITINERARY_COLLECTION)
+            .find({}, projection=None if full else SUMMARY_PROJECTION)
+            .sort("created_at", -1)
+            .skip(skip)
+            .limit(limit)
+            .batch_size(limit)
+        )
         itineraries = await cursor.to_list(length=limit)
         
-        result = []
-        for itinerary in itineraries:
-            itinerary['_id'] = str(itinerary['_id'])
-            result.append(ItineraryResponse(**itinerary))
+        # Documents come from our own collection, so skip re-validation
+        result = [
+            ItineraryResponse.model_construct(
+                _id=str(itinerary.pop('_id')),
+                content=itinerary.pop('content', ""),
+                **itinerary
+            )
+            for itinerary in itineraries
+        ]
         
-        logger.info(f"📋 Retrieved {len(result)} itineraries")
+        logger.info("📋 Retrieved %d itineraries", len(result))
         return result
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"❌ Error fetching itineraries: {e}")
+        logger.error("❌ Error fetching itineraries: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e)
@@ -200,6 +245,8 @@ async def get_weather_info(destination: str, forecast_days: int = None):
     
     Displays current or forecasted weather for selected destinations.
     """
+    from app.services.weather_service import weather_service
+    
     try:
         # If forecast requested
         if forecast_days:
@@ -228,7 +275,7 @@ async def get_weather_info(destination: str, forecast_days: int = None):
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"❌ Weather error: {e}")
+        logger.error("❌ Weather error: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e)
@@ -243,15 +290,16 @@ async def delete_itinerary(itinerary_id: str):
     Remove saved itinerary from database
     """
     try:
-        if not ObjectId.is_valid(itinerary_id):
+        try:
+            oid = ObjectId(itinerary_id)
+        except (InvalidId, TypeError):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Invalid itinerary ID format"
             )
         
-        db = get_database()
-        result = await db[settings.ITINERARY_COLLECTION].delete_one(
-            {"_id": ObjectId(itinerary_id)}
+        result = await get_collection(settings.ITINERARY_COLLECTION).delete_one(
+            {"_id": oid}
         )
         
         if result.deleted_count == 0:
@@ -260,13 +308,13 @@ async def delete_itinerary(itinerary_id: str):
                 detail="Itinerary not found"
             )
         
-        logger.info(f"🗑️ Deleted itinerary: {itinerary_id}")
+        logger.info("🗑️ Deleted itinerary: %s", itinerary_id)
         return {"message": "Itinerary deleted successfully", "id": itinerary_id}
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"❌ Error deleting itinerary: {e}")
+        logger.error("❌ Error deleting itinerary: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e)
@@ -1,51 +1,105 @@
 from fastapi import APIRouter, HTTPException, status, Query
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from app.models.suggestion_model import (
     SuggestedTrip,
     SuggestionsResponse,
     CreateSuggestionRequest,
-    SuggestedTripDB
+    SuggestedTripDB,
+    SUGGESTION_SCHEMA_VERSION
 )
-from app.services.ai_service import ai_service
-from app.db import get_database
+from app.db import get_collection
 from app.config import settings
-from typing import List, Optional
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from cachetools import TTLCache
 import logging
-from datetime import datetime
+import asyncio
+import orjson
+from datetime import datetime, timezone
+from functools import partial
+from types import MappingProxyType
 from bson import ObjectId
+from bson.errors import InvalidId
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import OperationFailure
+from pydantic import ValidationError
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# Documents stored at SUGGESTION_SCHEMA_VERSION went through
+# prepare_for_insert (or the admin create path) and passed SuggestedTripDB,
+# so reads can skip pydantic validation for them. Older rows are always
+# validated. Flip to False to re-validate every read.
+TRUSTED_DB_READS = True
+
+# Only the fields SuggestedTrip exposes are read back from MongoDB, plus
+# updated_at so cached response objects can be checked for staleness and
+# schema_version so already-normalized documents skip normalization
+_PROJECTION = (
+    {(field.alias or name): 1 for name, field in SuggestedTrip.model_fields.items()}
+    | {"_id": 1, "updated_at": 1, "schema_version": 1}
+)
+
+# Built SuggestedTrip objects by id -> (updated_at, trip); entries are reused
+# while the stored updated_at still matches
+_trip_cache: TTLCache = TTLCache(maxsize=2048, ttl=60)
+
+# Set once the collection is known to be non-empty, so GETs stop checking
+_db_seeded = False
+_seed_lock = asyncio.Lock()
+
+# In-flight background generation tasks, one per key
+_seed_tasks: Dict[tuple, asyncio.Task] = {}
+
+# Strong references to in-flight background writes until they finish
+_background_writes: set = set()
+
+# Suggestion fields stored as arrays
+_ARRAY_FIELDS = ('category', 'highlights', 'best_months', 'popular_activities', 'travel_tips')
+
+# SuggestedTrip fields by stored type, for the server-side migration's
+# check that a row is safe to stamp with the current schema_version
+_REQUIRED_STR_FIELDS = (
+    'destination', 'country', 'title', 'description', 'duration',
+    'best_time_to_visit', 'budget', 'estimated_cost'
+)
+_OPTIONAL_STR_FIELDS = ('continent', 'image_url', 'weather_info')
+
+# Tells a missing field apart from an explicit null
+_MISSING = object()
+
+# Documents fetched per cursor batch and updates sent per bulk_write
+# during migrations
+MIGRATION_BATCH_SIZE = 1000
+
+# Error codes MongoDB < 4.2 returns when an update is given as a pipeline
+# (TypeMismatch / FailedToParse); any other failure is a real error
+PIPELINE_UPDATE_UNSUPPORTED_CODES = frozenset({9, 14})
+
+
+def _as_list(value) -> list:
+    """Coerce a non-list array field value: strings are split on commas, anything else is []"""
+    if type(value) is not str:
+        return []
+    if ',' in value:
+        # Split comma-separated string
+        return [item.strip() for item in value.split(',') if item.strip()]
+    # Single value string -> array with one item
+    stripped = value.strip()
+    return [stripped] if stripped else []
+
 
 def normalize_suggestion_data(suggestion: dict) -> dict:
     """
     Normalize suggestion data to match Pydantic model expectations.
     Converts string fields to arrays where needed and ensures proper data types.
     """
-    # Fields that should be arrays
-    array_fields = ['category', 'highlights', 'best_months', 'popular_activities', 'travel_tips']
-    
-    for field in array_fields:
-        if field in suggestion:
-            value = suggestion[field]
-            
-            # Convert string to array
-            if isinstance(value, str):
-                if ',' in value:
-                    # Split comma-separated string
-                    suggestion[field] = [item.strip() for item in value.split(',') if item.strip()]
-                else:
-                    # Single value string -> array with one item
-                    suggestion[field] = [value.strip()] if value.strip() else []
-            
-            # Ensure it's a list
-            elif not isinstance(value, list):
-                suggestion[field] = []
-    
-    # Ensure required list fields exist
-    for field in array_fields:
-        if field not in suggestion:
-            suggestion[field] = []
+    # Single pass: lists are left alone, strings are split, anything else
+    # (including a missing field) becomes an empty list
+    for field in _ARRAY_FIELDS:
+        value = suggestion.get(field)
+        if type(value) is not list:
+            suggestion[field] = _as_list(value)
     
     # CRITICAL FIX: Ensure duration_days is always an integer
     if 'duration_days' in suggestion:
@@ -54,7 +108,7 @@ def normalize_suggestion_data(suggestion: dict) -> dict:
             suggestion['duration_days'] = int(round(suggestion['duration_days']))
         except (ValueError, TypeError):
             # Default to 7 days if conversion fails
-            logger.warning(f"Invalid duration_days value: {suggestion.get('duration_days')}, defaulting to 7")
+            logger.warning("Invalid duration_days value: %s, defaulting to 7", suggestion.get('duration_days'))
             suggestion['duration_days'] = 7
     
     # Ensure rating is a float if present
@@ -67,6 +121,266 @@ def normalize_suggestion_data(suggestion: dict) -> dict:
     return suggestion
 
 
+def normalize_for_construct(suggestion: dict) -> dict:
+    """
+    Read-path variant of normalize_suggestion_data: leaves the decoded
+    document alone and returns a shallow copy with only the fields that
+    needed coercion replaced, plus _id as a string.
+    """
+    patches = {'_id': str(suggestion['_id'])}
+    
+    for field in _ARRAY_FIELDS:
+        value = suggestion.get(field)
+        if type(value) is not list:
+            patches[field] = _as_list(value)
+    
+    if 'duration_days' in suggestion and type(suggestion['duration_days']) is not int:
+        try:
+            patches['duration_days'] = int(round(suggestion['duration_days']))
+        except (ValueError, TypeError):
+            logger.warning("Invalid duration_days value: %s, defaulting to 7", suggestion.get('duration_days'))
+            patches['duration_days'] = 7
+    
+    rating = suggestion.get('rating')
+    if rating is not None and type(rating) is not float:
+        try:
+            patches['rating'] = float(rating)
+        except (ValueError, TypeError):
+            patches['rating'] = None
+    
+    return suggestion | patches
+
+
+def trip_from_db(suggestion: dict, trusted: bool = True) -> SuggestedTrip:
+    """Build a SuggestedTrip from a normalized DB document"""
+    if trusted and TRUSTED_DB_READS:
+        return SuggestedTrip.model_construct(**suggestion)
+    return SuggestedTrip(**suggestion)
+
+
+def prepare_suggestion(
+    suggestion: dict,
+    now: datetime,
+    is_featured: bool = False
+) -> Optional[dict]:
+    """
+    Normalize, timestamp and validate one AI suggestion for insertion.
+    
+    Returns the document to store, or None (logged) if it fails
+    SuggestedTripDB validation, so nothing unvalidated is ever stamped
+    with the current schema_version.
+    """
+    suggestion = normalize_suggestion_data(suggestion)
+    suggestion['created_at'] = suggestion['updated_at'] = now
+    suggestion['is_featured'] = is_featured
+    suggestion['schema_version'] = SUGGESTION_SCHEMA_VERSION
+    try:
+        return SuggestedTripDB.model_validate(suggestion).model_dump()
+    except ValidationError as e:
+        logger.warning("⚠️ Skipping invalid AI suggestion: %s", e)
+        return None
+
+
+def prepare_for_insert(suggestions: List[dict], featured: int = 0) -> List[dict]:
+    """
+    Run prepare_suggestion over a batch, dropping invalid ones.
+    The first `featured` valid suggestions are marked as featured.
+    """
+    now = datetime.now(timezone.utc)
+    docs = []
+    for suggestion in suggestions:
+        doc = prepare_suggestion(suggestion, now, is_featured=len(docs) < featured)
+        if doc is not None:
+            docs.append(doc)
+    return docs
+
+
+def cached_trip(suggestion: dict) -> SuggestedTrip:
+    """Return the cached SuggestedTrip for a DB document, building it on a miss"""
+    suggestion_id = str(suggestion['_id'])
+    updated_at = suggestion.pop('updated_at', None)
+    
+    entry = _trip_cache.get(suggestion_id)
+    if entry is not None and entry[0] == updated_at:
+        return entry[1]
+    
+    # Documents are normalized and validated on write; legacy rows are
+    # normalized and fully validated here
+    if suggestion.pop('schema_version', None) == SUGGESTION_SCHEMA_VERSION:
+        suggestion['_id'] = suggestion_id
+        trip = trip_from_db(suggestion)
+    else:
+        trip = trip_from_db(normalize_for_construct(suggestion), trusted=False)
+    _trip_cache[suggestion_id] = (updated_at, trip)
+    return trip
+
+
+async def find_page_and_count(
+    collection,
+    query: dict,
+    skip: int,
+    limit: int,
+    after: Optional[dict] = None
+) -> Tuple[List[dict], int]:
+    """Run the indexed page query and the filtered count concurrently"""
+    cursor = collection.find(
+        {"$and": [query, after]} if after else query,
+        projection=_PROJECTION
+    ).sort([("rating", -1), ("_id", 1)])
+    if skip:
+        cursor = cursor.skip(skip)
+    page, total = await asyncio.gather(
+        cursor.limit(limit).to_list(length=limit),
+        collection.count_documents(query)
+    )
+    return page, total
+
+
+async def fetch_suggestions_page(
+    query: dict,
+    skip: int,
+    limit: int,
+    after: Optional[dict] = None
+) -> Tuple[List[dict], int]:
+    """
+    Fetch one page of suggestions (sorted by rating, then _id) and the total
+    number of matches for `query`.
+    
+    With an `after` keyset predicate the page is a plain find on the
+    (rating, _id) indexes, since $facet sub-pipelines can't use indexes and
+    would still scan everything before the cursor; the count runs alongside
+    it. Offset pages use a single $facet aggregation, falling back to the
+    same find + count_documents where $facet is unsupported.
+    """
+    collection = get_collection(settings.SUGGESTIONS_COLLECTION)
+    if after:
+        return await find_page_and_count(collection, query, 0, limit, after)
+    
+    data_stages = [{"$skip": skip}, {"$limit": limit}] if skip else [{"$limit": limit}]
+    data_stages.append({"$project": _PROJECTION})
+    
+    pipeline = [
+        {"$match": query},
+        {"$sort": {"rating": -1, "_id": 1}},
+        {"$facet": {
+            "data": data_stages,
+            "total": [{"$count": "n"}]
+        }}
+    ]
+    try:
+        results = await collection.aggregate(pipeline).to_list(length=1)
+    except OperationFailure as e:
+        # $facet unsupported (MongoDB < 3.4): run the page and count concurrently
+        logger.warning("⚠️ $facet unavailable (%s), fetching page and count separately", e)
+        return await find_page_and_count(collection, query, skip, limit)
+    
+    page = results[0] if results else {"data": [], "total": []}
+    total = page["total"][0]["n"] if page["total"] else 0
+    return page["data"], total
+
+
+async def ensure_seeded() -> None:
+    """Seed the collection with AI suggestions if it is empty"""
+    global _db_seeded
+    from app.services.ai_service import ai_service
+    
+    async with _seed_lock:
+        if _db_seeded:
+            return
+        
+        collection = get_collection(settings.SUGGESTIONS_COLLECTION)
+        if await collection.estimated_document_count() == 0:
+            logger.info("🤖 Database empty, generating initial AI suggestions...")
+            try:
+                ai_suggestions = await ai_service.generate_suggestions(count=12)
+                
+                # Normalize and validate all AI suggestions before inserting
+                ai_suggestions = prepare_for_insert(ai_suggestions, featured=6)
+                
+                if not ai_suggestions:
+                    return
+                
+                await collection.insert_many(ai_suggestions)
+                logger.info("✅ Seeded %d initial suggestions", len(ai_suggestions))
+            except Exception as e:
+                # Leave the flag unset so the next request retries
+                logger.error("❌ Failed to generate initial suggestions: %s", e)
+                return
+        
+        _db_seeded = True
+
+
+async def seed_filtered(
+    category: Optional[str],
+    budget: Optional[str],
+    continent: Optional[str],
+    count: int
+) -> None:
+    """Generate and store AI suggestions for filters that had no matches"""
+    from app.services.ai_service import ai_service
+    
+    logger.info("🤖 No matches for filters, generating AI suggestions...")
+    try:
+        ai_suggestions = await ai_service.generate_suggestions(
+            category=category,
+            budget=budget,
+            continent=continent,
+            count=count
+        )
+        
+        # Normalize and validate all AI suggestions before inserting
+        ai_suggestions = prepare_for_insert(ai_suggestions)
+        
+        if ai_suggestions:
+            await get_collection(settings.SUGGESTIONS_COLLECTION).insert_many(ai_suggestions)
+            mark_seeded()
+            logger.info("✅ Generated %d filtered suggestions", len(ai_suggestions))
+    except Exception as e:
+        logger.error("❌ Failed to generate filtered suggestions: %s", e)
+
+
+def seed_in_background(key: tuple, seed) -> None:
+    """Run `seed()` without blocking the response, unless `key` is already running"""
+    if key in _seed_tasks:
+        return
+    task = asyncio.create_task(seed())
+    _seed_tasks[key] = task
+    task.add_done_callback(lambda _: _seed_tasks.pop(key, None))
+
+
+def mark_seeded(seeded: bool = True) -> None:
+    """Record that the collection has (or no longer has) documents"""
+    global _db_seeded
+    _db_seeded = seeded
+
+
+def parse_oid(value: str, detail: str = "Invalid suggestion ID format") -> ObjectId:
+    """Parse an ObjectId once, raising 400 if it is malformed"""
+    try:
+        return ObjectId(value)
+    except (InvalidId, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=detail
+        )
+
+
+def keyset_after(after_rating: Optional[float], after_id: ObjectId) -> dict:
+    """
+    Predicate for documents that sort after (after_rating, after_id) in the
+    rating desc, _id asc order. MongoDB sorts null/missing ratings last
+    there, so unrated documents follow every rated one; a None
+    after_rating is a cursor inside that unrated tail.
+    """
+    if after_rating is None:
+        return {"rating": None, "_id": {"$gt": after_id}}
+    return {"$or": [
+        {"rating": {"$lt": after_rating}},
+        {"rating": after_rating, "_id": {"$gt": after_id}},
+        {"rating": None}
+    ]}
+
+
 @router.get("/", response_model=SuggestionsResponse)
 async def get_suggestions(
     category: Optional[str] = Query(None, description="Filter by category (adventure, culture, beach, etc.)"),
@@ -76,7 +390,10 @@ async def get_suggestions(
     continent: Optional[str] = Query(None, description="Filter by continent"),
     featured: bool = Query(False, description="Get only featured suggestions"),
     limit: int = Query(10, ge=1, le=50, description="Results per page"),
-    skip: int = Query(0, ge=0, description="Number of results to skip"),
+    skip: int = Query(0, ge=0, description="Number of results to skip (prefer after_rating/after_id)"),
+    after_rating: Optional[float] = Query(None, description="Cursor: rating of the last item on the previous page"),
+    after_id: Optional[str] = Query(None, description="Cursor: id of the last item on the previous page"),
+    after_unrated: bool = Query(False, description="Cursor: the last item on the previous page had no rating"),
     suggestion_id: Optional[str] = Query(None, description="Get specific suggestion by ID")
 ):
     """
@@ -92,21 +409,18 @@ async def get_suggestions(
     - Filter by category, budget, continent, duration
     - Get featured/top-rated suggestions
     - Get specific suggestion by ID
-    - Auto-generates AI suggestions if database is empty
+    - Cursor pagination via after_rating/after_id (see next_cursor)
+    - Auto-generates AI suggestions in the background if database is empty
+      or a filter has no matches (they show up on a later request)
     """
     try:
-        db = get_database()
-        
         # If specific ID requested, return that suggestion
         if suggestion_id:
-            if not ObjectId.is_valid(suggestion_id):
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Invalid suggestion ID format"
-                )
+            oid = parse_oid(suggestion_id)
             
-            suggestion = await db[settings.SUGGESTIONS_COLLECTION].find_one(
-                {"_id": ObjectId(suggestion_id)}
+            suggestion = await get_collection(settings.SUGGESTIONS_COLLECTION).find_one(
+                {"_id": oid},
+                projection=_PROJECTION
             )
             
             if not suggestion:
@@ -115,14 +429,10 @@ async def get_suggestions(
                     detail="Suggestion not found"
                 )
             
-            # Normalize data before returning
-            suggestion = normalize_suggestion_data(suggestion)
-            suggestion['_id'] = str(suggestion['_id'])
-            
             return SuggestionsResponse(
                 total=1,
-                suggestions=[SuggestedTrip(**suggestion)],
-                filters_applied={"_id": suggestion_id}
+                suggestions=[cached_trip(suggestion)],
+                filters_applied=MappingProxyType({"_id": suggestion_id})
             )
         
         # Build query filter
@@ -154,89 +464,145 @@ async def get_suggestions(
             query["duration_days"] = duration_query
             has_filters = True
         
+        # Read-only snapshot of the filters, shared by the response
+        filters_applied = MappingProxyType(dict(query))
+        
         effective_limit = min(limit, 10) if has_filters else limit
         
-        # Auto-generate if database is empty
-        total_in_db = await db[settings.SUGGESTIONS_COLLECTION].count_documents({})
-        if total_in_db == 0:
-            logger.info("🤖 Database empty, generating initial AI suggestions...")
-            try:
-                ai_suggestions = await ai_service.generate_suggestions(count=12)
-                
-                # Normalize all AI suggestions before inserting
-                for i, suggestion in enumerate(ai_suggestions):
-                    suggestion = normalize_suggestion_data(suggestion)
-                    suggestion['created_at'] = datetime.utcnow()
-                    suggestion['updated_at'] = datetime.utcnow()
-                    suggestion['is_featured'] = i < 6
-                    ai_suggestions[i] = suggestion
-                
-                if ai_suggestions:
-                    await db[settings.SUGGESTIONS_COLLECTION].insert_many(ai_suggestions)
-                    logger.info(f"✅ Seeded {len(ai_suggestions)} initial suggestions")
-            except Exception as e:
-                logger.error(f"❌ Failed to generate initial suggestions: {e}")
+        # Keyset cursor: constant-cost pages instead of scanning past `skip`.
+        # A cursor is after_id plus exactly one of after_rating/after_unrated.
+        after = None
+        if after_id or after_rating is not None or after_unrated:
+            if not after_id or (after_rating is not None) == after_unrated:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Cursor needs after_id and either after_rating or after_unrated=true"
+                )
+            after = keyset_after(after_rating, parse_oid(after_id, "Invalid cursor ID format"))
+            skip = 0
+        elif skip > 200:
+            logger.warning("⚠️ Deep skip pagination (skip=%d); use after_rating/after_id instead", skip)
+        
+        # Auto-generate if database is empty (checked until first seen non-empty)
+        if not _db_seeded:
+            seed_in_background(("initial",), ensure_seeded)
         
-        # Query with filters
-        cursor = db[settings.SUGGESTIONS_COLLECTION].find(query).sort("rating", -1).skip(skip).limit(effective_limit)
-        suggestions = await cursor.to_list(length=effective_limit)
-        total = await db[settings.SUGGESTIONS_COLLECTION].count_documents(query)
+        # Paged fetch + filtered count in one round-trip
+        suggestions, total = await fetch_suggestions_page(query, skip, effective_limit, after)
         
         # Generate AI suggestions if no matches for filters
-        if total == 0 and has_filters and not suggestion_id:
-            logger.info(f"🤖 No matches for filters, generating AI suggestions...")
-            try:
-                ai_suggestions = await ai_service.generate_suggestions(
-                    category=category,
-                    budget=budget,
-                    continent=continent,
-                    count=min(effective_limit, 6)
-                )
-                
-                # Normalize all AI suggestions before inserting
-                for suggestion in ai_suggestions:
-                    suggestion = normalize_suggestion_data(suggestion)
-                    suggestion['created_at'] = datetime.utcnow()
-                    suggestion['updated_at'] = datetime.utcnow()
-                    suggestion['is_featured'] = False
-                
-                if ai_suggestions:
-                    await db[settings.SUGGESTIONS_COLLECTION].insert_many(ai_suggestions)
-                    logger.info(f"✅ Generated {len(ai_suggestions)} filtered suggestions")
-                    
-                    cursor = db[settings.SUGGESTIONS_COLLECTION].find(query).sort("rating", -1).limit(effective_limit)
-                    suggestions = await cursor.to_list(length=effective_limit)
-                    total = len(suggestions)
-            except Exception as e:
-                logger.error(f"❌ Failed to generate filtered suggestions: {e}")
+        if total == 0 and has_filters:
+            seed_in_background(
+                ("filtered", category, budget, continent),
+                partial(seed_filtered, category, budget, continent, min(effective_limit, 6))
+            )
         
-        # Normalize all suggestions and convert to response models
-        normalized_suggestions = []
-        for s in suggestions:
-            s = normalize_suggestion_data(s)
-            s['_id'] = str(s['_id'])
-            normalized_suggestions.append(s)
+        # Convert to response models, reusing cached ones that are still current
+        result = [cached_trip(s) for s in suggestions]
         
-        result = [SuggestedTrip(**s) for s in normalized_suggestions]
+        logger.info("📋 Retrieved %d suggestions (total: %d)", len(result), total)
         
-        logger.info(f"📋 Retrieved {len(result)} suggestions (total: {total})")
+        # Cursor for the next page, if this page was full; unrated items
+        # sort last and get an after_unrated cursor
+        next_cursor = None
+        if len(result) == effective_limit:
+            next_cursor = {
+                "after_rating": result[-1].rating,
+                "after_id": result[-1].id,
+                "after_unrated": result[-1].rating is None
+            }
         
-        return SuggestionsResponse(
-            total=total,
-            suggestions=result,
-            filters_applied=query
-        )
+        # Serialize once with orjson instead of re-validating through the
+        # response model; same shape as SuggestionsResponse
+        return ORJSONResponse({
+            "total": total,
+            "suggestions": [s.model_dump(by_alias=True) for s in result],
+            # orjson only serializes real dicts
+            "filters_applied": dict(filters_applied),
+            "next_cursor": next_cursor
+        })
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"❌ Error fetching suggestions: {e}", exc_info=True)
+        logger.error("❌ Error fetching suggestions: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e)
         )
 
 
+async def stream_ai_suggestions(
+    category: Optional[str],
+    budget: Optional[str],
+    continent: Optional[str],
+    count: int,
+    save_to_db: bool
+) -> AsyncIterator[bytes]:
+    """
+    Yield generated suggestions as NDJSON lines, one per suggestion.
+    
+    Ids are assigned up front so each line carries its final _id; the
+    documents are inserted together once the stream ends, even if the
+    client disconnects part-way, so every id already sent is stored.
+    """
+    from app.services.ai_service import ai_service
+    
+    to_save = []
+    now = datetime.now(timezone.utc)
+    try:
+        # Each suggestion arrives as soon as the model finishes writing it
+        async for suggestion in ai_service.generate_suggestions_stream(
+            category=category,
+            budget=budget,
+            continent=continent,
+            count=count
+        ):
+            if save_to_db:
+                # Validated against the stored shape before it is sent
+                doc = prepare_suggestion(suggestion, now)
+                if doc is None:
+                    continue
+                doc['_id'] = ObjectId()
+                trip = trip_from_db({**doc, '_id': str(doc['_id'])})
+                to_save.append(doc)
+            else:
+                suggestion = normalize_suggestion_data(suggestion)
+                suggestion['created_at'] = now
+                try:
+                    trip = SuggestedTrip(**{**suggestion, '_id': None})
+                except ValidationError as e:
+                    logger.warning("⚠️ Skipping invalid AI suggestion: %s", e)
+                    continue
+            
+            yield orjson.dumps(trip.model_dump(by_alias=True)) + b"\n"
+    except Exception as e:
+        # Headers are already sent, so end the stream instead of raising
+        logger.error("❌ Error streaming AI suggestions: %s", e, exc_info=True)
+    finally:
+        # A disconnect closes the generator (GeneratorExit), so nothing can
+        # be awaited here; the insert runs as its own task
+        if to_save:
+            save_in_background(save_streamed_suggestions(to_save))
+
+
+async def save_streamed_suggestions(docs: List[dict]) -> None:
+    """Insert the suggestions sent by stream_ai_suggestions"""
+    try:
+        await get_collection(settings.SUGGESTIONS_COLLECTION).insert_many(docs)
+        mark_seeded()
+        logger.info("💾 Saved %d streamed AI suggestions", len(docs))
+    except Exception as e:
+        logger.error("❌ Failed to save streamed AI suggestions: %s", e)
+
+
+def save_in_background(write) -> None:
+    """Run a DB write without tying it to the request that started it"""
+    task = asyncio.create_task(write)
+    _background_writes.add(task)
+    task.add_done_callback(_background_writes.discard)
+
+
 @router.post("/ai-generate", response_model=List[SuggestedTrip])
 async def generate_ai_suggestions(
     category: Optional[str] = Query(None, description="Generate for specific category"),
@@ -244,7 +610,8 @@ async def generate_ai_suggestions(
     continent: Optional[str] = Query(None, description="Generate for specific continent"),
     destination: Optional[str] = Query(None, description="Generate for specific destination"),
     count: int = Query(6, ge=1, le=10, description="Number of suggestions"),
-    save_to_db: bool = Query(True, description="Save to database")
+    save_to_db: bool = Query(True, description="Save to database"),
+    stream: bool = Query(False, description="Stream suggestions as NDJSON lines as they are ready")
 ):
     """
     🎯 ROUTE 2: Generate NEW AI-powered travel suggestions
@@ -253,6 +620,7 @@ async def generate_ai_suggestions(
     - Generate multiple suggestions with filters
     - Generate specific destination suggestion
     - Optionally save to database
+    - Optionally stream results as NDJSON (stream=true, filters only)
     
     Each suggestion includes:
     - Destination and country
@@ -260,30 +628,43 @@ async def generate_ai_suggestions(
     - Best time to visit
     - Duration, budget, activities
     """
+    from app.services.ai_service import ai_service
+    
     try:
-        logger.info(f"🤖 Generating AI suggestions")
+        logger.info("🤖 Generating AI suggestions")
         
         # Generate for specific destination
         if destination:
-            logger.info(f"🤖 Generating AI suggestion for: {destination}")
-            ai_suggestion = await ai_service.generate_single_suggestion(destination)
-            
-            # Normalize the AI-generated suggestion
-            ai_suggestion = normalize_suggestion_data(ai_suggestion)
+            logger.info("🤖 Generating AI suggestion for: %s", destination)
+            # A saved suggestion must be newly generated, not a cached copy
+            # that was already inserted
+            ai_suggestion = await ai_service.generate_single_suggestion(destination, fresh=save_to_db)
             
             if save_to_db:
-                db = get_database()
-                ai_suggestion['created_at'] = datetime.utcnow()
-                ai_suggestion['updated_at'] = datetime.utcnow()
-                ai_suggestion['is_featured'] = False
+                # Normalize and validate before inserting
+                ai_suggestion = prepare_suggestion(ai_suggestion, datetime.now(timezone.utc))
+                if ai_suggestion is None:
+                    raise ValueError(f"AI returned an invalid suggestion for {destination}")
                 
-                result = await db[settings.SUGGESTIONS_COLLECTION].insert_one(ai_suggestion)
+                result = await get_collection(settings.SUGGESTIONS_COLLECTION).insert_one(ai_suggestion)
+                mark_seeded()
                 ai_suggestion['_id'] = str(result.inserted_id)
-                logger.info(f"💾 Saved AI suggestion for {destination}")
+                logger.info("💾 Saved AI suggestion for %s", destination)
+                # Already validated by prepare_suggestion
+                trip = trip_from_db(ai_suggestion)
             else:
+                # Normalize the AI-generated suggestion
+                ai_suggestion = normalize_suggestion_data(ai_suggestion)
                 ai_suggestion['_id'] = None
+                trip = SuggestedTrip(**ai_suggestion)
             
-            return [SuggestedTrip(**ai_suggestion)]
+            return ORJSONResponse([trip.model_dump(by_alias=True)])
+        
+        if stream:
+            return StreamingResponse(
+                stream_ai_suggestions(category, budget, continent, count, save_to_db),
+                media_type="application/x-ndjson"
+            )
         
         # Generate multiple suggestions with filters
         ai_suggestions = await ai_service.generate_suggestions(
@@ -293,38 +674,36 @@ async def generate_ai_suggestions(
             count=count
         )
         
-        # Normalize all AI-generated suggestions
-        normalized_suggestions = []
-        for suggestion in ai_suggestions:
-            suggestion = normalize_suggestion_data(suggestion)
-            normalized_suggestions.append(suggestion)
-        
         if save_to_db:
-            db = get_database()
-            for suggestion in normalized_suggestions:
-                suggestion['created_at'] = datetime.utcnow()
-                suggestion['updated_at'] = datetime.utcnow()
-                suggestion['is_featured'] = False
+            # Normalize and validate, dropping invalid suggestions
+            normalized_suggestions = prepare_for_insert(ai_suggestions)
             
-            result = await db[settings.SUGGESTIONS_COLLECTION].insert_many(normalized_suggestions)
-            logger.info(f"💾 Saved {len(result.inserted_ids)} AI suggestions")
+            if normalized_suggestions:
+                result = await get_collection(settings.SUGGESTIONS_COLLECTION).insert_many(normalized_suggestions)
+                mark_seeded()
+                logger.info("💾 Saved %d AI suggestions", len(result.inserted_ids))
+                
+                for i, inserted_id in enumerate(result.inserted_ids):
+                    normalized_suggestions[i]['_id'] = str(inserted_id)
             
-            for i, inserted_id in enumerate(result.inserted_ids):
-                normalized_suggestions[i]['_id'] = str(inserted_id)
-        
-        result = [SuggestedTrip(**s) for s in normalized_suggestions]
+            # Already validated by prepare_for_insert
+            trips = [trip_from_db(s) for s in normalized_suggestions]
+        else:
+            # Normalize all AI-generated suggestions
+            trips = [SuggestedTrip(**normalize_suggestion_data(s)) for s in ai_suggestions]
         
-        logger.info(f"✅ Generated {len(result)} AI suggestions")
-        return result
+        logger.info("✅ Generated %d AI suggestions", len(trips))
+        # Serialize with orjson instead of re-validating through the response model
+        return ORJSONResponse([t.model_dump(by_alias=True) for t in trips])
         
     except ValueError as e:
-        logger.error(f"❌ Validation error: {e}")
+        logger.error("❌ Validation error: %s", e)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
     except Exception as e:
-        logger.error(f"❌ Error generating AI suggestions: {e}", exc_info=True)
+        logger.error("❌ Error generating AI suggestions: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e)
@@ -343,70 +722,61 @@ async def create_or_update_suggestion(
     Otherwise: Creates new suggestion
     """
     try:
-        db = get_database()
-        
         # Update existing suggestion
         if suggestion_id:
-            if not ObjectId.is_valid(suggestion_id):
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Invalid suggestion ID format"
-                )
+            oid = parse_oid(suggestion_id)
             
             update_data = request.model_dump()
             update_data = normalize_suggestion_data(update_data)
-            update_data['updated_at'] = datetime.utcnow()
+            update_data['updated_at'] = datetime.now(timezone.utc)
+            update_data['schema_version'] = SUGGESTION_SCHEMA_VERSION
             
-            result = await db[settings.SUGGESTIONS_COLLECTION].update_one(
-                {"_id": ObjectId(suggestion_id)},
-                {"$set": update_data}
+            # Update and read back the new document in one round-trip
+            updated = await get_collection(settings.SUGGESTIONS_COLLECTION).find_one_and_update(
+                {"_id": oid},
+                {"$set": update_data},
+                projection=_PROJECTION,
+                return_document=ReturnDocument.AFTER
             )
             
-            if result.matched_count == 0:
+            if updated is None:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail="Suggestion not found"
                 )
             
-            updated = await db[settings.SUGGESTIONS_COLLECTION].find_one(
-                {"_id": ObjectId(suggestion_id)}
-            )
-            
-            updated = normalize_suggestion_data(updated)
-            updated['_id'] = str(updated['_id'])
-            logger.info(f"✅ Suggestion updated: {suggestion_id}")
+            logger.info("✅ Suggestion updated: %s", suggestion_id)
             
-            return SuggestedTrip(**updated)
+            # The new updated_at replaces any cached copy
+            return cached_trip(updated)
         
         # Create new suggestion
         suggestion_data = request.model_dump()
         suggestion_data = normalize_suggestion_data(suggestion_data)
         
+        now = datetime.now(timezone.utc)
         suggestion_db = SuggestedTripDB(
             **suggestion_data,
             is_featured=False,
-            created_at=datetime.utcnow(),
-            updated_at=datetime.utcnow()
+            created_at=now,
+            updated_at=now
         )
         
-        result = await db[settings.SUGGESTIONS_COLLECTION].insert_one(
-            suggestion_db.model_dump()
-        )
-        
-        created = await db[settings.SUGGESTIONS_COLLECTION].find_one(
-            {"_id": result.inserted_id}
-        )
+        # The inserted document is exactly what we hold locally, so return
+        # it with its new _id instead of reading it back
+        created = suggestion_db.model_dump()
+        result = await get_collection(settings.SUGGESTIONS_COLLECTION).insert_one(created)
+        mark_seeded()
         
-        created = normalize_suggestion_data(created)
-        created['_id'] = str(created['_id'])
-        logger.info(f"✅ Suggestion created: {result.inserted_id}")
+        created['_id'] = str(result.inserted_id)
+        logger.info("✅ Suggestion created: %s", result.inserted_id)
         
-        return SuggestedTrip(**created)
+        return trip_from_db(created)
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"❌ Error creating/updating suggestion: {e}", exc_info=True)
+        logger.error("❌ Error creating/updating suggestion: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e)
@@ -425,12 +795,12 @@ async def delete_suggestion(
     Otherwise: Deletes specific suggestion by ID
     """
     try:
-        db = get_database()
-        
         # Clear all suggestions (Admin)
         if clear_all:
-            result = await db[settings.SUGGESTIONS_COLLECTION].delete_many({})
-            logger.info(f"🗑️ Cleared {result.deleted_count} suggestions")
+            result = await get_collection(settings.SUGGESTIONS_COLLECTION).delete_many({})
+            mark_seeded(False)
+            _trip_cache.clear()
+            logger.info("🗑️ Cleared %s suggestions", result.deleted_count)
             
             return {
                 "message": "All suggestions cleared",
@@ -438,14 +808,8 @@ async def delete_suggestion(
             }
         
         # Delete specific suggestion
-        if not ObjectId.is_valid(suggestion_id):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Invalid suggestion ID format"
-            )
-        
-        result = await db[settings.SUGGESTIONS_COLLECTION].delete_one(
-            {"_id": ObjectId(suggestion_id)}
+        result = await get_collection(settings.SUGGESTIONS_COLLECTION).delete_one(
+            {"_id": parse_oid(suggestion_id)}
         )
         
         if result.deleted_count == 0:
@@ -453,20 +817,217 @@ async def delete_suggestion(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Suggestion not found"
             )
+        _trip_cache.pop(suggestion_id, None)
         
-        logger.info(f"🗑️ Deleted suggestion: {suggestion_id}")
+        logger.info("🗑️ Deleted suggestion: %s", suggestion_id)
         return {"message": "Suggestion deleted successfully", "id": suggestion_id}
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"❌ Error deleting suggestion: {e}")
+        logger.error("❌ Error deleting suggestion: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e)
         )
 
 
+def is_stampable(suggestion: dict) -> bool:
+    """
+    Python twin of stampable_expr(): whether a stored document already has
+    the exact types SuggestedTrip expects. Both migration paths use this
+    strict check, so a row's trust never depends on which path ran.
+    """
+    created_at = suggestion.get('created_at', _MISSING)
+    rating = suggestion.get('rating')
+    return (
+        all(type(suggestion.get(field)) is str for field in _REQUIRED_STR_FIELDS)
+        and all(
+            suggestion.get(field) is None or type(suggestion[field]) is str
+            for field in _OPTIONAL_STR_FIELDS
+        )
+        and all(
+            type(suggestion.get(field)) is list
+            and all(type(item) is str for item in suggestion[field])
+            for field in _ARRAY_FIELDS
+        )
+        and type(suggestion.get('duration_days')) is int
+        and (created_at is _MISSING or isinstance(created_at, datetime))
+        and (rating is None or (type(rating) is float and 0 <= rating <= 5))
+    )
+
+
+def type_in(field: str, types: List[str]) -> dict:
+    """Aggregation expression: the BSON type of `field` itself is one of `types`"""
+    return {"$in": [{"$type": f"${field}"}, types]}
+
+
+def stampable_expr() -> dict:
+    """
+    $expr matching documents whose stored types are what SuggestedTrip
+    expects, so reads can construct them without validation. Stricter
+    than pydantic (no lax coercions), which only leaves more rows legacy.
+    Keep in step with is_stampable().
+    """
+    checks = [type_in(field, ["string"]) for field in _REQUIRED_STR_FIELDS]
+    checks += [type_in(field, ["string", "null", "missing"]) for field in _OPTIONAL_STR_FIELDS]
+    checks += [
+        {"$and": [
+            type_in(field, ["array"]),
+            {"$allElementsTrue": [{"$map": {
+                "input": f"${field}",
+                "in": {"$eq": [{"$type": "$$this"}, "string"]}
+            }}]}
+        ]}
+        for field in _ARRAY_FIELDS
+    ]
+    checks += [
+        type_in("duration_days", ["int", "long"]),
+        type_in("created_at", ["date", "missing"]),
+        {"$or": [
+            type_in("rating", ["null", "missing"]),
+            {"$and": [
+                type_in("rating", ["double"]),
+                {"$gte": ["$rating", 0]},
+                {"$lte": ["$rating", 5]}
+            ]}
+        ]}
+    ]
+    return {"$and": checks}
+
+
+async def migrate_string_to_array_client_side(collection) -> Tuple[int, int]:
+    """
+    Normalize array fields by streaming every document through
+    normalize_suggestion_data (fallback for MongoDB < 4.2).
+    
+    Returns (updated documents, total documents)
+    """
+    updated_count = 0
+    total_docs = 0
+    ops: List[UpdateOne] = []
+    
+    # Stream documents instead of loading the whole collection
+    async for suggestion in collection.find({}).batch_size(MIGRATION_BATCH_SIZE):
+        total_docs += 1
+        # Use the normalize function
+        normalized = normalize_suggestion_data(suggestion.copy())
+        
+        # Check if any fields were changed
+        needs_update = False
+        updates = {}
+        
+        # Missing array fields are written as [] too, like the server-side path
+        for field in _ARRAY_FIELDS:
+            if field not in suggestion or normalized[field] != suggestion[field]:
+                updates[field] = normalized[field]
+                needs_update = True
+        
+        # Also update duration_days and rating if they were normalized
+        # (an int rating is rewritten as a float)
+        for field in ('duration_days', 'rating'):
+            if field in normalized and field in suggestion:
+                old, new = suggestion[field], normalized[field]
+                if type(old) is not type(new) or old != new:
+                    updates[field] = new
+                    needs_update = True
+        
+        # Only rows whose stored shape (after these updates) passes the same
+        # strict check as the server-side path are stamped; the rest stay
+        # legacy and are validated on every read
+        if (
+            suggestion.get('schema_version') != SUGGESTION_SCHEMA_VERSION
+            and is_stampable(suggestion | updates)
+        ):
+            updates['schema_version'] = SUGGESTION_SCHEMA_VERSION
+            needs_update = True
+        
+        if needs_update:
+            ops.append(UpdateOne({"_id": suggestion['_id']}, {"$set": updates}))
+            updated_count += 1
+        
+        # Flush updates in batches rather than one round-trip per document
+        if len(ops) >= MIGRATION_BATCH_SIZE:
+            await collection.bulk_write(ops, ordered=False)
+            ops = []
+    
+    if ops:
+        await collection.bulk_write(ops, ordered=False)
+    
+    return updated_count, total_docs
+
+
+async def migrate_string_to_array_server_side(collection) -> Tuple[int, int]:
+    """
+    Normalize array fields with pipeline updates so no documents leave the
+    server (MongoDB 4.2+). Mirrors normalize_suggestion_data: strings are
+    split on commas, trimmed and stripped of empty parts; anything that is
+    neither a string nor an array (including a missing field) becomes [].
+    
+    Returns (modified field updates, total documents)
+    """
+    updated_count = 0
+    
+    for field in _ARRAY_FIELDS:
+        split_and_trim = {
+            "$filter": {
+                "input": {
+                    "$map": {
+                        "input": {"$split": [f"${field}", ","]},
+                        "as": "part",
+                        "in": {"$trim": {"input": "$$part"}}
+                    }
+                },
+                "as": "part",
+                "cond": {"$ne": ["$$part", ""]}
+            }
+        }
+        # $expr/$type checks the field itself; a plain {"$type": ...} query
+        # would also match arrays that merely contain a string
+        result = await collection.update_many(
+            {"$expr": type_in(field, ["string"])},
+            [{"$set": {field: split_and_trim}}]
+        )
+        updated_count += result.modified_count
+        
+        result = await collection.update_many(
+            {"$expr": {"$not": [type_in(field, ["string", "array"])]}},
+            {"$set": {field: []}}
+        )
+        updated_count += result.modified_count
+    
+    # Round fractional durations to whole days
+    result = await collection.update_many(
+        {"$expr": type_in("duration_days", ["double"])},
+        [{"$set": {"duration_days": {"$toInt": {"$round": ["$duration_days", 0]}}}}]
+    )
+    updated_count += result.modified_count
+    
+    # Ratings become doubles (or null when unparseable), as in
+    # normalize_suggestion_data
+    result = await collection.update_many(
+        {"$expr": {"$not": [type_in("rating", ["double", "null", "missing"])]}},
+        [{"$set": {"rating": {"$convert": {
+            "input": "$rating", "to": "double", "onError": None, "onNull": None
+        }}}}]
+    )
+    updated_count += result.modified_count
+    
+    # Mark normalized rows that also have the shape SuggestedTrip expects,
+    # so reads skip normalization and validation; others stay legacy
+    result = await collection.update_many(
+        {
+            "schema_version": {"$ne": SUGGESTION_SCHEMA_VERSION},
+            "$expr": stampable_expr()
+        },
+        {"$set": {"schema_version": SUGGESTION_SCHEMA_VERSION}}
+    )
+    updated_count += result.modified_count
+    
+    total_docs = await collection.estimated_document_count()
+    return updated_count, total_docs
+
+
 @router.post("/migrate")
 async def migrate_database(
     operation: str = Query("string-to-array", description="Migration operation type")
@@ -478,51 +1039,29 @@ async def migrate_database(
     - string-to-array: Convert string fields to arrays
     - seed-ai: Seed database with AI suggestions
     """
+    from app.services.ai_service import ai_service
+    
     try:
-        db = get_database()
-        
         if operation == "string-to-array":
-            # Convert string fields to arrays
-            cursor = db[settings.SUGGESTIONS_COLLECTION].find({})
-            suggestions = await cursor.to_list(length=None)
-            
-            updated_count = 0
-            
-            for suggestion in suggestions:
-                # Use the normalize function
-                normalized = normalize_suggestion_data(suggestion.copy())
-                
-                # Check if any fields were changed
-                needs_update = False
-                updates = {}
-                
-                array_fields = ['category', 'highlights', 'best_months', 'popular_activities', 'travel_tips']
-                for field in array_fields:
-                    if field in normalized and field in suggestion:
-                        if normalized[field] != suggestion[field]:
-                            updates[field] = normalized[field]
-                            needs_update = True
-                
-                # Also update duration_days if it was normalized
-                if 'duration_days' in normalized and 'duration_days' in suggestion:
-                    if normalized['duration_days'] != suggestion['duration_days']:
-                        updates['duration_days'] = normalized['duration_days']
-                        needs_update = True
-                
-                if needs_update:
-                    await db[settings.SUGGESTIONS_COLLECTION].update_one(
-                        {"_id": suggestion['_id']},
-                        {"$set": updates}
-                    )
-                    updated_count += 1
+            # Convert string fields to arrays, server-side when supported
+            collection = get_collection(settings.SUGGESTIONS_COLLECTION)
+            try:
+                updated_count, total_docs = await migrate_string_to_array_server_side(collection)
+            except OperationFailure as e:
+                if e.code not in PIPELINE_UPDATE_UNSUPPORTED_CODES:
+                    raise
+                logger.warning("⚠️ Pipeline updates unsupported (%s), migrating client-side", e)
+                updated_count, total_docs = await migrate_string_to_array_client_side(collection)
+            # Migrations rewrite fields without touching updated_at
+            _trip_cache.clear()
             
-            logger.info(f"✅ Migration complete: Updated {updated_count} documents")
+            logger.info("✅ Migration complete: Updated %s documents", updated_count)
             
             return {
                 "message": "Migration completed successfully",
                 "operation": operation,
                 "updated_count": updated_count,
-                "total_documents": len(suggestions)
+                "total_documents": total_docs
             }
         
         elif operation == "seed-ai":
@@ -531,17 +1070,18 @@ async def migrate_database(
             
             ai_suggestions = await ai_service.generate_suggestions(count=10)
             
-            # Normalize all AI suggestions before inserting
-            for i, suggestion in enumerate(ai_suggestions):
-                suggestion = normalize_suggestion_data(suggestion)
-                suggestion['created_at'] = datetime.utcnow()
-                suggestion['updated_at'] = datetime.utcnow()
-                suggestion['is_featured'] = i < 3
-                ai_suggestions[i] = suggestion
+            # Normalize and validate all AI suggestions before inserting
+            ai_suggestions = prepare_for_insert(ai_suggestions, featured=3)
+            if not ai_suggestions:
+                raise HTTPException(
+                    status_code=status.HTTP_502_BAD_GATEWAY,
+                    detail="AI returned no valid suggestions"
+                )
             
-            result = await db[settings.SUGGESTIONS_COLLECTION].insert_many(ai_suggestions)
+            result = await get_collection(settings.SUGGESTIONS_COLLECTION).insert_many(ai_suggestions)
+            mark_seeded()
             
-            logger.info(f"✅ Seeded {len(result.inserted_ids)} AI suggestions")
+            logger.info("✅ Seeded %d AI suggestions", len(result.inserted_ids))
             
             return {
                 "message": "Successfully seeded AI suggestions",
@@ -558,7 +1098,7 @@ async def migrate_database(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"❌ Error during migration: {e}")
+        logger.error("❌ Error during migration: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e)
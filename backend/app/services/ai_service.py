@@ -1,13 +1,248 @@
 from openai import AsyncOpenAI
+import httpx
 from app.config import settings
 from app.models.itinerary_model import ItineraryRequest, StreamChunk
-from typing import AsyncGenerator, List, Dict, Optional
+from typing import AsyncGenerator, Hashable, List, Dict, Optional, Tuple
+from cachetools import TTLCache
+from diskcache import Cache
+from functools import lru_cache
 import logging
 import asyncio
-import json
+import copy
+import hashlib
+import orjson
+import re
 
 logger = logging.getLogger(__name__)
 
+# Returned when the AI tips call fails
+DEFAULT_TRAVEL_TIPS = [
+    "Research local customs and etiquette",
+    "Learn basic phrases in the local language",
+    "Check visa requirements in advance",
+    "Get travel insurance",
+    "Keep digital and physical copies of important documents"
+]
+
+_WORD_RE = re.compile(r"\w+")
+
+# Numbered list item: a digit within the first three characters
+_LEAD_DIGIT_RE = re.compile(r"\D{0,2}\d")
+
+# Leading ```/```json and trailing ``` around a model's JSON reply
+_FENCE_RE = re.compile(r"\A\s*```(?:json)?\s*|\s*```\s*\Z", re.IGNORECASE)
+
+# How long cached AI responses are reused, in memory and on disk
+RESPONSE_CACHE_TTL = 24 * 60 * 60
+
+# How long generate_single_suggestion waits to coalesce concurrent calls
+SUGGESTION_BATCH_WINDOW = 0.05
+
+# Most destinations asked for in one batched request; larger queues are split
+SUGGESTION_BATCH_MAX = 5
+
+# Fields requested for each destination suggestion
+SUGGESTION_FIELDS = """- destination, country, continent
+- title (catchy trip title)
+- description (2-3 engaging sentences)
+- duration and duration_days
+- highlights (5 main attractions)
+- best_time_to_visit and best_months
+- category (list of applicable categories)
+- budget level and estimated_cost
+- rating (4.5-5.0)
+- popular_activities (5 activities)
+- travel_tips (5 practical tips)
+"""
+
+# Static system prompts. Everything that does not depend on the request lives
+# here so each request shares a byte-identical prefix the provider can cache;
+# the per-request details go at the end of the user message.
+ITINERARY_SYSTEM_PROMPT = """You are an expert travel planner with extensive knowledge of destinations worldwide. Provide detailed, practical, and personalized travel itineraries.
+
+For every trip, please provide:
+1. Day-by-day itinerary with morning, afternoon, and evening activities
+2. Specific recommendations for restaurants, attractions, and experiences
+3. Estimated costs for each day
+4. Travel tips and local insights
+5. Best transportation options
+6. Cultural etiquette and important notes
+
+Format the response in clean markdown with clear sections for each day.
+Include practical details like opening hours, booking requirements, and insider tips.
+"""
+
+SUGGESTIONS_SYSTEM_PROMPT = """You are a travel expert who generates destination recommendations. Always respond with valid JSON only.
+
+For each destination, provide:
+1. destination (city/place name)
+2. country
+3. continent (Asia, Europe, Africa, North America, South America, Oceania)
+4. title (catchy trip title)
+5. description (2-3 sentences about the destination)
+6. duration (e.g., "5-7 days")
+7. duration_days (numeric, average days)
+8. highlights (list of 5 main attractions)
+9. best_time_to_visit (brief description)
+10. best_months (list of 3-letter month abbreviations)
+11. category (list, choose from: adventure, culture, beach, mountains, city, nature, food, romantic, hiking, photography, luxury)
+12. budget (budget, moderate, or high/luxury)
+13. estimated_cost (price range as string, e.g., "$1000-$2000")
+14. rating (float between 4.5-5.0)
+15. popular_activities (list of 5 activities)
+16. travel_tips (list of 5 practical tips)
+
+Return ONLY a valid JSON array of objects. No additional text or markdown.
+"""
+
+TIPS_SYSTEM_PROMPT = (
+    "You are a travel expert providing practical tips. "
+    "Provide 5 essential travel tips for visiting the given destination. "
+    "Be concise and practical. Format as a numbered list."
+)
+
+DESTINATION_SYSTEM_PROMPT = f"""You are a travel expert who generates detailed destination information. Always respond with valid JSON only.
+
+For each destination, provide complete information including:
+{SUGGESTION_FIELDS}"""
+
+
+def _prompt_key(kind: str, *args) -> tuple:
+    """
+    Cache key for an AI call: string arguments are casefolded and reduced to
+    their words, so "Paris, France" and "  paris france" share one entry.
+    """
+    return (kind,) + tuple(
+        " ".join(_WORD_RE.findall(arg.casefold())) if isinstance(arg, str) else arg
+        for arg in args
+    )
+
+
+async def _sse_deltas(response: httpx.Response) -> AsyncGenerator[str, None]:
+    """Yield the content deltas from an OpenAI-style chat completion SSE stream"""
+    async for line in response.aiter_lines():
+        # Skips blank lines and ": keep-alive" comments
+        if not line.startswith("data: "):
+            continue
+        data = line[6:]
+        if data == "[DONE]":
+            break
+        choices = orjson.loads(data).get("choices")
+        if choices:
+            content = choices[0].get("delta", {}).get("content")
+            if content:
+                yield content
+
+
+def _disk_key(cache_key: tuple) -> str:
+    """Stable, process-independent key for the disk cache"""
+    return hashlib.blake2b(orjson.dumps(cache_key), digest_size=16).hexdigest()
+
+
+def _same_destination(requested: str, returned) -> bool:
+    """
+    Whether a suggestion's destination names the requested one, allowing
+    either to carry extra trailing words ("Paris" vs "Paris, France")
+    """
+    if not isinstance(returned, str):
+        return False
+    wanted = _WORD_RE.findall(requested.casefold())
+    got = _WORD_RE.findall(returned.casefold())
+    if not wanted or not got:
+        return False
+    shorter = min(len(wanted), len(got))
+    return wanted[:shorter] == got[:shorter]
+
+
+def _fill_suggestion_defaults(suggestion: Dict) -> None:
+    """Add the fields an AI suggestion may be missing, in place"""
+    suggestion['is_featured'] = False
+    suggestion['created_at'] = None  # Will be set when saved to DB
+    suggestion['updated_at'] = None
+    
+    # Ensure all required fields exist
+    if 'rating' not in suggestion:
+        suggestion['rating'] = 4.7
+    if 'duration_days' not in suggestion:
+        # Try to parse from duration string
+        duration_str = suggestion.get('duration', '7 days')
+        try:
+            suggestion['duration_days'] = int(duration_str.split('-')[0].split()[0])
+        except:
+            suggestion['duration_days'] = 7
+
+
+class _JsonObjectScanner:
+    """
+    Pull complete top-level JSON objects out of text that arrives in pieces,
+    e.g. a streamed JSON array. Tracks brace depth outside of strings.
+    """
+    
+    def __init__(self):
+        self._buffer: List[str] = []
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+    
+    def feed(self, text: str) -> List[str]:
+        """Consume more text and return the objects it completed"""
+        completed = []
+        for char in text:
+            if self._depth:
+                self._buffer.append(char)
+            
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == '\\':
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '{':
+                if not self._depth:
+                    self._buffer = ['{']
+                self._depth += 1
+            elif char == '}' and self._depth:
+                self._depth -= 1
+                if not self._depth:
+                    completed.append("".join(self._buffer))
+            elif char == '"' and self._depth:
+                self._in_string = True
+        return completed
+
+
+@lru_cache(maxsize=256)
+def _itinerary_prompt(
+    destination: str,
+    days: int,
+    travelers: int,
+    budget: str,
+    interests: Tuple[str, ...],
+    start_date: Optional[str],
+    additional_preferences: Optional[str]
+) -> str:
+    """
+    Build the itinerary user prompt. Cached so identical requests (e.g. the
+    same trip via /generate and /generate-stream) reuse the same string.
+    """
+    prompt = f"""Create a detailed {days}-day travel itinerary.
+
+Trip Details:
+- Destination: {destination}
+- Duration: {days} days
+- Number of travelers: {travelers}
+- Budget: {budget}
+- Interests: {', '.join(interests)}
+"""
+    
+    if start_date:
+        prompt += f"- Start date: {start_date}\n"
+    
+    if additional_preferences:
+        prompt += f"- Additional preferences: {additional_preferences}\n"
+    
+    return prompt
+
 
 class AIService:
     """Service for AI-powered itinerary and suggestion generation using Llama via OpenRouter"""
@@ -21,43 +256,90 @@ class AIService:
                 base_url=settings.LLAMA_BASE_URL,
                 api_key=settings.LLAMA_API_KEY
             )
+            # Raw HTTP client for streaming, so deltas are parsed with orjson
+            # instead of becoming SDK objects one by one
+            self._http = httpx.AsyncClient(
+                base_url=settings.LLAMA_BASE_URL,
+                headers={
+                    "Authorization": f"Bearer {settings.LLAMA_API_KEY}",
+                    "Content-Type": "application/json"
+                },
+                timeout=httpx.Timeout(60.0, connect=10.0)
+            )
             self.model_name = settings.LLAMA_MODEL
+            self.fast_model_name = settings.LLAMA_MODEL_FAST
+            # Successful per-destination responses, reused for a day; the disk
+            # layer keeps them across restarts and shares them between workers
+            self._response_cache = TTLCache(maxsize=512, ttl=RESPONSE_CACHE_TTL)
+            self._disk_cache = Cache(settings.LLM_CACHE_DIR, size_limit=int(1e9))
+            # generate_single_suggestion calls waiting for the next batch:
+            # key -> (destination, cache key, waiting futures)
+            self._pending_singles: Dict[Hashable, Tuple[str, tuple, List[asyncio.Future]]] = {}
+            self._flush_task: Optional[asyncio.Task] = None
             logger.info(f"✅ Llama AI initialized with model: {self.model_name}")
         else:
             logger.warning("⚠️ No AI provider configured")
             raise ValueError("LLAMA_API_KEY is required")
     
+    async def aclose(self) -> None:
+        """Close pooled HTTP connections (called on app shutdown)"""
+        await self._http.aclose()
+        await self.client.close()
+    
+    async def _open_raw_stream(self, payload: Dict) -> httpx.Response:
+        """Start a streaming chat completion and return the open response"""
+        request = self._http.build_request(
+            "POST",
+            "/chat/completions",
+            content=orjson.dumps({**payload, "stream": True})
+        )
+        response = await self._http.send(request, stream=True)
+        if response.is_error:
+            await response.aread()
+            await response.aclose()
+            response.raise_for_status()
+        return response
+    
+    async def _cache_get(self, cache_key: tuple):
+        """Look up a cached response in memory, then on disk"""
+        value = self._response_cache.get(cache_key)
+        if value is None:
+            # diskcache does blocking SQLite I/O; keep it off the event loop.
+            # A disk error is just a miss.
+            try:
+                value = await asyncio.to_thread(self._disk_cache.get, _disk_key(cache_key))
+            except Exception as e:
+                logger.warning(f"⚠️ Disk cache read failed: {e}")
+                value = None
+            if value is not None:
+                self._response_cache[cache_key] = value
+        return value
+    
+    async def _cache_set(self, cache_key: tuple, value) -> None:
+        """
+        Store a response in memory and write it through to disk. Disk
+        errors (e.g. diskcache.Timeout under contention) are logged, never
+        raised, so caching can't fail a request.
+        """
+        self._response_cache[cache_key] = value
+        try:
+            await asyncio.to_thread(
+                self._disk_cache.set, _disk_key(cache_key), value, expire=RESPONSE_CACHE_TTL
+            )
+        except Exception as e:
+            logger.warning(f"⚠️ Disk cache write failed: {e}")
+    
     def _create_prompt(self, request: ItineraryRequest) -> str:
-        """Create detailed prompt for AI"""
-        prompt = f"""Create a detailed {request.days}-day travel itinerary for {request.destination}.
-
-Trip Details:
-- Destination: {request.destination}
-- Duration: {request.days} days
-- Number of travelers: {request.travelers}
-- Budget: {request.budget}
-- Interests: {', '.join(request.interests)}
-"""
-        
-        if request.start_date:
-            prompt += f"- Start date: {request.start_date}\n"
-        
-        if request.additional_preferences:
-            prompt += f"- Additional preferences: {request.additional_preferences}\n"
-        
-        prompt += """
-Please provide:
-1. Day-by-day itinerary with morning, afternoon, and evening activities
-2. Specific recommendations for restaurants, attractions, and experiences
-3. Estimated costs for each day
-4. Travel tips and local insights
-5. Best transportation options
-6. Cultural etiquette and important notes
-
-Format the response in clean markdown with clear sections for each day.
-Include practical details like opening hours, booking requirements, and insider tips.
-"""
-        return prompt
+        """Create the per-request part of the itinerary prompt"""
+        return _itinerary_prompt(
+            request.destination,
+            request.days,
+            request.travelers,
+            request.budget,
+            tuple(request.interests),
+            request.start_date,
+            request.additional_preferences
+        )
     
     async def generate_itinerary(self, request: ItineraryRequest) -> str:
         """Generate complete itinerary (non-streaming)"""
@@ -69,7 +351,7 @@ Include practical details like opening hours, booking requirements, and insider
                 messages=[
                     {
                         "role": "system", 
-                        "content": "You are an expert travel planner with extensive knowledge of destinations worldwide. Provide detailed, practical, and personalized travel itineraries."
+                        "content": ITINERARY_SYSTEM_PROMPT
                     },
                     {
                         "role": "user", 
@@ -100,41 +382,64 @@ Include practical details like opening hours, booking requirements, and insider
                 f"✨ Generating personalized recommendations..."
             ]
             
-            # Emit thought process
-            for thought in thoughts:
-                yield StreamChunk(
-                    type="thought",
-                    content=thought,
-                    metadata={"step": thoughts.index(thought) + 1}
-                )
-                await asyncio.sleep(0.5)
-            
-            # Generate actual itinerary with streaming
+            # Start the LLM request now so its round-trip overlaps the thoughts
             prompt = self._create_prompt(request)
             
-            stream = await self.client.chat.completions.create(
-                model=self.model_name,
-                messages=[
+            stream_task = asyncio.create_task(self._open_raw_stream({
+                "model": self.model_name,
+                "messages": [
                     {
                         "role": "system", 
-                        "content": "You are an expert travel planner with extensive knowledge of destinations worldwide. Provide detailed, practical, and personalized travel itineraries."
+                        "content": ITINERARY_SYSTEM_PROMPT
                     },
                     {
                         "role": "user", 
                         "content": prompt
                     }
                 ],
-                temperature=0.7,
-                max_tokens=4000,
-                stream=True
-            )
+                "temperature": 0.7,
+                "max_tokens": 4000
+            }))
             
-            async for chunk in stream:
-                if chunk.choices[0].delta.content:
+            # Emit thought process back-to-back; the UI paces their display
+            try:
+                for step, thought in enumerate(thoughts, 1):
                     yield StreamChunk(
-                        type="content",
-                        content=chunk.choices[0].delta.content
+                        type="thought",
+                        content=thought,
+                        metadata={"step": step}
                     )
+            except GeneratorExit:
+                # Client went away before the request was needed
+                stream_task.cancel()
+                if stream_task.done() and not stream_task.cancelled() and stream_task.exception() is None:
+                    await stream_task.result().aclose()
+                raise
+            
+            # Generate actual itinerary with streaming
+            response = await stream_task
+            
+            # Coalesce token deltas so each SSE frame carries a batch of them
+            loop = asyncio.get_running_loop()
+            buffer: List[str] = []
+            batch_size = settings.STREAM_MIN_BATCH
+            last_flush = loop.time()
+            
+            try:
+                async for delta in _sse_deltas(response):
+                    buffer.append(delta)
+                    
+                    if len(buffer) >= batch_size or loop.time() - last_flush >= settings.STREAM_FLUSH_INTERVAL:
+                        yield StreamChunk(type="content", content="".join(buffer))
+                        buffer.clear()
+                        last_flush = loop.time()
+                        # Small first batches keep time-to-first-text low
+                        batch_size = min(int(batch_size * settings.STREAM_BATCH_GROWTH), settings.STREAM_MAX_BATCH)
+            finally:
+                await response.aclose()
+            
+            if buffer:
+                yield StreamChunk(type="content", content="".join(buffer))
             
             # Completion signal
             yield StreamChunk(
@@ -153,15 +458,20 @@ Include practical details like opening hours, booking requirements, and insider
     
     async def generate_travel_tips(self, destination: str) -> list[str]:
         """Generate quick travel tips for a destination"""
+        cache_key = _prompt_key("tips", destination)
+        cached = await self._cache_get(cache_key)
+        if cached is not None:
+            return cached[:]
+        
         try:
-            prompt = f"Provide 5 essential travel tips for visiting {destination}. Be concise and practical. Format as a numbered list."
+            prompt = f"Destination: {destination}"
             
             response = await self.client.chat.completions.create(
-                model=self.model_name,
+                model=self.fast_model_name,
                 messages=[
                     {
                         "role": "system",
-                        "content": "You are a travel expert providing practical tips."
+                        "content": TIPS_SYSTEM_PROMPT
                     },
                     {
                         "role": "user",
@@ -177,19 +487,16 @@ Include practical details like opening hours, booking requirements, and insider
             tips = [
                 line.strip() 
                 for line in tips_text.split('\n') 
-                if line.strip() and any(char.isdigit() for char in line[:3])
+                if line.strip() and _LEAD_DIGIT_RE.match(line)
             ]
-            return tips[:5]
+            tips = tips[:5]
+            if tips:
+                await self._cache_set(cache_key, tips[:])
+            return tips
             
         except Exception as e:
             logger.error(f"❌ Error generating tips: {e}")
-            return [
-                "Research local customs and etiquette",
-                "Learn basic phrases in the local language",
-                "Check visa requirements in advance",
-                "Get travel insurance",
-                "Keep digital and physical copies of important documents"
-            ]
+            return DEFAULT_TRAVEL_TIPS[:]
     
     async def generate_suggestions(
         self, 
@@ -210,6 +517,38 @@ Include practical details like opening hours, booking requirements, and insider
         Returns:
             List of suggestion dictionaries matching the SuggestedTrip model
         """
+        suggestions = [
+            suggestion async for suggestion in self.generate_suggestions_stream(
+                category=category,
+                budget=budget,
+                continent=continent,
+                count=count
+            )
+        ]
+        logger.info(f"✅ Generated {len(suggestions)} AI suggestions")
+        return suggestions
+    
+    async def generate_suggestions_stream(
+        self, 
+        category: Optional[str] = None,
+        budget: Optional[str] = None,
+        continent: Optional[str] = None,
+        count: int = 6
+    ) -> AsyncGenerator[Dict, None]:
+        """
+        Stream AI-powered travel suggestions, yielding each one as soon as
+        its JSON object is complete in the model output
+        
+        Args:
+            category: Type of trip (adventure, culture, beach, etc.)
+            budget: Budget level (budget, moderate, luxury)
+            continent: Continent filter (Asia, Europe, etc.)
+            count: Number of suggestions to generate
+        
+        Yields:
+            Suggestion dictionaries matching the SuggestedTrip model
+        """
+        content = ""
         try:
             # Build prompt based on filters
             prompt = f"Generate {count} unique travel destination suggestions"
@@ -225,35 +564,14 @@ Include practical details like opening hours, booking requirements, and insider
             if filters:
                 prompt += f" matching these criteria: {', '.join(filters)}"
             
-            prompt += """
-
-For each destination, provide:
-1. destination (city/place name)
-2. country
-3. continent (Asia, Europe, Africa, North America, South America, Oceania)
-4. title (catchy trip title)
-5. description (2-3 sentences about the destination)
-6. duration (e.g., "5-7 days")
-7. duration_days (numeric, average days)
-8. highlights (list of 5 main attractions)
-9. best_time_to_visit (brief description)
-10. best_months (list of 3-letter month abbreviations)
-11. category (list, choose from: adventure, culture, beach, mountains, city, nature, food, romantic, hiking, photography, luxury)
-12. budget (budget, moderate, or high/luxury)
-13. estimated_cost (price range as string, e.g., "$1000-$2000")
-14. rating (float between 4.5-5.0)
-15. popular_activities (list of 5 activities)
-16. travel_tips (list of 5 practical tips)
-
-Return ONLY a valid JSON array of objects. No additional text or markdown.
-"""
+            prompt += "."
             
-            response = await self.client.chat.completions.create(
+            stream = await self.client.chat.completions.create(
                 model=self.model_name,
                 messages=[
                     {
                         "role": "system",
-                        "content": "You are a travel expert who generates destination recommendations. Always respond with valid JSON only."
+                        "content": SUGGESTIONS_SYSTEM_PROMPT
                     },
                     {
                         "role": "user",
@@ -261,42 +579,39 @@ Return ONLY a valid JSON array of objects. No additional text or markdown.
                     }
                 ],
                 temperature=0.8,  # Higher creativity for varied suggestions
-                max_tokens=3000
+                max_tokens=3000,
+                stream=True
             )
             
-            # Parse AI response
-            content = response.choices[0].message.content.strip()
-            
-            # Remove markdown code blocks if present
-            if content.startswith("```"):
-                content = content.split("```")[1]
-                if content.startswith("json"):
-                    content = content[4:]
-                content = content.strip()
+            scanner = _JsonObjectScanner()
+            received: List[str] = []
+            yielded = 0
             
-            suggestions = json.loads(content)
+            async for chunk in stream:
+                delta = chunk.choices[0].delta.content
+                if not delta:
+                    continue
+                received.append(delta)
+                
+                for content in scanner.feed(delta):
+                    suggestion = orjson.loads(content)
+                    _fill_suggestion_defaults(suggestion)
+                    yielded += 1
+                    yield suggestion
             
-            # Validate and add missing fields
-            for suggestion in suggestions:
-                suggestion['is_featured'] = False
-                suggestion['created_at'] = None  # Will be set when saved to DB
-                suggestion['updated_at'] = None
+            if not yielded:
+                # Nothing object-shaped arrived; parse the whole reply so an
+                # empty array is fine and anything else reports invalid JSON
+                content = "".join(received).strip()
                 
-                # Ensure all required fields exist
-                if 'rating' not in suggestion:
-                    suggestion['rating'] = 4.7
-                if 'duration_days' not in suggestion:
-                    # Try to parse from duration string
-                    duration_str = suggestion.get('duration', '7 days')
-                    try:
-                        suggestion['duration_days'] = int(duration_str.split('-')[0].split()[0])
-                    except:
-                        suggestion['duration_days'] = 7
-            
-            logger.info(f"✅ Generated {len(suggestions)} AI suggestions")
-            return suggestions
+                # Remove markdown code fences if present
+                content = _FENCE_RE.sub("", content).strip()
+                
+                for suggestion in orjson.loads(content):
+                    _fill_suggestion_defaults(suggestion)
+                    yield suggestion
             
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             logger.error(f"❌ JSON parsing error: {e}")
             logger.error(f"Response content: {content}")
             raise ValueError(f"AI returned invalid JSON: {str(e)}")
@@ -304,32 +619,96 @@ Return ONLY a valid JSON array of objects. No additional text or markdown.
             logger.error(f"❌ Error generating suggestions: {e}")
             raise
     
-    async def generate_single_suggestion(self, destination: str) -> Dict:
+    async def generate_single_suggestion(self, destination: str, fresh: bool = False) -> Dict:
         """
         Generate a detailed suggestion for a specific destination
         
+        Concurrent calls arriving within SUGGESTION_BATCH_WINDOW are
+        coalesced into one batched LLM request.
+        
         Args:
             destination: Name of the destination
+            fresh: Skip the cache and don't share a result with other
+                callers (use when the suggestion will be saved, so repeated
+                calls don't store identical copies)
         
         Returns:
             Suggestion dictionary matching the SuggestedTrip model
         """
+        # Callers mutate the returned dict, so hand out copies
+        cache_key = _prompt_key("single", destination)
+        if not fresh:
+            cached = await self._cache_get(cache_key)
+            if cached is not None:
+                return copy.deepcopy(cached)
+        
+        # Fresh calls get their own slot in the batch; others share one per
+        # destination
+        pending_key = object() if fresh else cache_key
+        future = asyncio.get_running_loop().create_future()
+        self._pending_singles.setdefault(pending_key, (destination, cache_key, []))[2].append(future)
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_single_suggestions())
+        return await future
+    
+    async def _flush_single_suggestions(self) -> None:
+        """Answer every queued generate_single_suggestion call, in batches"""
+        await asyncio.sleep(SUGGESTION_BATCH_WINDOW)
+        pending, self._pending_singles = self._pending_singles, {}
+        self._flush_task = None
+        
+        queued = list(pending.values())
+        await asyncio.gather(*(
+            self._answer_single_suggestions(queued[start:start + SUGGESTION_BATCH_MAX])
+            for start in range(0, len(queued), SUGGESTION_BATCH_MAX)
+        ))
+    
+    async def _answer_single_suggestions(
+        self,
+        batch: List[Tuple[str, tuple, List[asyncio.Future]]]
+    ) -> None:
+        """
+        Generate one batch of queued suggestions and resolve their futures.
+        Destinations the batched reply doesn't cover (or the whole batch,
+        if the reply is unusable) fall back to one request each.
+        """
+        destinations = [destination for destination, _, _ in batch]
+        suggestions: List = [None] * len(batch)
+        if len(batch) > 1:
+            try:
+                suggestions = await self.generate_suggestions_batch(destinations)
+            except Exception as e:
+                logger.warning(f"⚠️ Batched suggestions failed ({e}), generating one by one")
+        
+        missing = [i for i, suggestion in enumerate(suggestions) if suggestion is None]
+        if missing:
+            results = await asyncio.gather(
+                *(self._generate_single_suggestion(destinations[i]) for i in missing),
+                return_exceptions=True
+            )
+            for i, result in zip(missing, results):
+                suggestions[i] = result
+        
+        # Answer every caller before any cache write, so a slow or failing
+        # disk never holds up a request
+        for (_, _, futures), suggestion in zip(batch, suggestions):
+            for future in futures:
+                if future.done():
+                    continue
+                if isinstance(suggestion, BaseException):
+                    future.set_exception(suggestion)
+                else:
+                    future.set_result(copy.deepcopy(suggestion))
+        
+        for (_, cache_key, _), suggestion in zip(batch, suggestions):
+            if not isinstance(suggestion, BaseException):
+                await self._cache_set(cache_key, copy.deepcopy(suggestion))
+    
+    async def _generate_single_suggestion(self, destination: str) -> Dict:
+        """Generate one destination suggestion with its own LLM request"""
         try:
             prompt = f"""Generate a detailed travel suggestion for {destination}.
 
-Provide complete information including:
-- destination, country, continent
-- title (catchy trip title)
-- description (2-3 engaging sentences)
-- duration and duration_days
-- highlights (5 main attractions)
-- best_time_to_visit and best_months
-- category (list of applicable categories)
-- budget level and estimated_cost
-- rating (4.5-5.0)
-- popular_activities (5 activities)
-- travel_tips (5 practical tips)
-
 Return ONLY a valid JSON object. No additional text or markdown.
 """
             
@@ -338,7 +717,7 @@ Return ONLY a valid JSON object. No additional text or markdown.
                 messages=[
                     {
                         "role": "system",
-                        "content": "You are a travel expert who generates detailed destination information. Always respond with valid JSON only."
+                        "content": DESTINATION_SYSTEM_PROMPT
                     },
                     {
                         "role": "user",
@@ -351,14 +730,10 @@ Return ONLY a valid JSON object. No additional text or markdown.
             
             content = response.choices[0].message.content.strip()
             
-            # Remove markdown code blocks if present
-            if content.startswith("```"):
-                content = content.split("```")[1]
-                if content.startswith("json"):
-                    content = content[4:]
-                content = content.strip()
+            # Remove markdown code fences if present
+            content = _FENCE_RE.sub("", content).strip()
             
-            suggestion = json.loads(content)
+            suggestion = orjson.loads(content)
             suggestion['is_featured'] = False
             
             logger.info(f"✅ Generated suggestion for {destination}")
@@ -367,7 +742,77 @@ Return ONLY a valid JSON object. No additional text or markdown.
         except Exception as e:
             logger.error(f"❌ Error generating single suggestion: {e}")
             raise
+    
+    async def generate_suggestions_batch(self, destinations: List[str]) -> List[Optional[Dict]]:
+        """
+        Generate detailed suggestions for several destinations in one request
+        
+        Replies are matched back by their destination field, not position,
+        so a reordered reply still reaches the right caller.
+        
+        Args:
+            destinations: Destination names (at most SUGGESTION_BATCH_MAX)
+        
+        Returns:
+            Suggestion dictionaries in the same order as destinations, with
+            None where the reply had no suggestion for that destination
+        """
+        if len(destinations) > SUGGESTION_BATCH_MAX:
+            raise ValueError(f"At most {SUGGESTION_BATCH_MAX} destinations per batch")
+        
+        try:
+            numbered = "\n".join(f"{i}. {destination}" for i, destination in enumerate(destinations, 1))
+            prompt = f"""Generate a detailed travel suggestion for each of these {len(destinations)} destinations:
+{numbered}
 
+Return ONLY a valid JSON array where element j corresponds to destination j. No additional text or markdown.
+"""
+            
+            response = await self.client.chat.completions.create(
+                model=self.model_name,
+                messages=[
+                    {
+                        "role": "system",
+                        "content": DESTINATION_SYSTEM_PROMPT
+                    },
+                    {
+                        "role": "user",
+                        "content": prompt
+                    }
+                ],
+                temperature=0.7,
+                max_tokens=1500 * len(destinations)
+            )
+            
+            content = response.choices[0].message.content.strip()
+            
+            # Remove markdown code fences if present
+            content = _FENCE_RE.sub("", content).strip()
+            
+            replies = orjson.loads(content)
+            if not isinstance(replies, list):
+                raise ValueError("AI returned no suggestion array")
+            
+            # Each reply goes to the first unanswered destination it names
+            suggestions: List[Optional[Dict]] = [None] * len(destinations)
+            for reply in replies:
+                if not isinstance(reply, dict):
+                    continue
+                for i, destination in enumerate(destinations):
+                    if suggestions[i] is None and _same_destination(destination, reply.get('destination')):
+                        reply['is_featured'] = False
+                        suggestions[i] = reply
+                        break
+            
+            matched = sum(suggestion is not None for suggestion in suggestions)
+            if matched < len(destinations):
+                logger.warning(f"⚠️ Batch reply covered {matched} of {len(destinations)} destinations")
+            logger.info(f"✅ Generated {matched} destination suggestions in one batch")
+            return suggestions
+            
+        except Exception as e:
+            logger.error(f"❌ Error generating suggestion batch: {e}")
+            raise
 
 # Global instance
 ai_service = AIService()
\ No newline at end of file
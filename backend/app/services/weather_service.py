@@ -1,16 +1,23 @@
 import httpx
+from cachetools import TTLCache
 from app.config import settings
 from typing import Dict, Any, Optional
+from collections import Counter
+from operator import itemgetter
 import logging
+import asyncio
 from datetime import datetime, timedelta
 
 logger = logging.getLogger(__name__)
 
+# Fields read from the "main" block of a current-weather response
+_MAIN_FIELDS = itemgetter("temp", "feels_like", "temp_min", "temp_max", "humidity", "pressure")
+
 
 class WeatherService:
     """Service for fetching weather data from OpenWeatherMap API"""
     
-    BASE_URL = "https://api.openweathermap.org/data/2.5/weather?units=metric&q="
+    BASE_URL = "https://api.openweathermap.org/data/2.5"
     
     def __init__(self):
         self.api_key = settings.OPENWEATHER_API_KEY
@@ -20,17 +27,41 @@ class WeatherService:
         else:
             logger.info("✅ Weather service initialized")
         
-        self.cache = {}  # Simple in-memory cache
-        self.cache_duration = timedelta(hours=1)
+        # Bounded cache; entries expire an hour after they are stored
+        self.cache = TTLCache(maxsize=1024, ttl=timedelta(hours=1).total_seconds())
+        
+        # Requests currently in flight, by cache key
+        self._inflight: Dict[str, asyncio.Task] = {}
+        
+        # One pooled client so keep-alive connections are reused across calls
+        self._client = httpx.AsyncClient(
+            base_url=self.BASE_URL,
+            timeout=10.0,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100)
+        )
+    
+    async def aclose(self) -> None:
+        """Close pooled HTTP connections (called on app shutdown)"""
+        await self._client.aclose()
+    
+    async def _single_flight(self, cache_key: str, fetch) -> Optional[Dict[str, Any]]:
+        """
+        Run fetch() at most once per cache key at a time; concurrent callers
+        for the same key await the same in-flight request
+        """
+        task = self._inflight.get(cache_key)
+        if task is None:
+            task = asyncio.create_task(fetch())
+            self._inflight[cache_key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(cache_key, None))
+        
+        # Shielded so one caller giving up doesn't cancel it for the others
+        return await asyncio.shield(task)
     
     def _get_cache_key(self, city: str, weather_type: str) -> str:
         """Generate cache key"""
         return f"{city.lower().strip()}_{weather_type}"
     
-    def _is_cache_valid(self, timestamp: datetime) -> bool:
-        """Check if cache is still valid"""
-        return datetime.utcnow() - timestamp < self.cache_duration
-    
     async def get_current_weather(self, city: str) -> Optional[Dict[str, Any]]:
         """
         Get current weather for a city
@@ -48,50 +79,53 @@ class WeatherService:
         cache_key = self._get_cache_key(city, "current")
         
         # Check cache
-        if cache_key in self.cache:
-            cached_data, timestamp = self.cache[cache_key]
-            if self._is_cache_valid(timestamp):
-                logger.info(f"📦 Weather cache hit for {city}")
-                return cached_data
+        cached_data = self.cache.get(cache_key)
+        if cached_data is not None:
+            logger.info(f"📦 Weather cache hit for {city}")
+            return cached_data
         
+        return await self._single_flight(cache_key, lambda: self._fetch_current_weather(city, cache_key))
+    
+    async def _fetch_current_weather(self, city: str, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Fetch current weather from the API and cache it"""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.BASE_URL}/weather",
-                    params={
-                        "q": city,
-                        "appid": self.api_key,
-                        "units": "metric"
-                    },
-                    timeout=10.0
-                )
-                response.raise_for_status()
-                data = response.json()
-                
-                # Format response
-                weather_data = {
-                    "city": data["name"],
-                    "country": data["sys"]["country"],
-                    "temperature": round(data["main"]["temp"], 1),
-                    "feels_like": round(data["main"]["feels_like"], 1),
-                    "temp_min": round(data["main"]["temp_min"], 1),
-                    "temp_max": round(data["main"]["temp_max"], 1),
-                    "humidity": data["main"]["humidity"],
-                    "pressure": data["main"]["pressure"],
-                    "description": data["weather"][0]["description"].capitalize(),
-                    "icon": data["weather"][0]["icon"],
-                    "wind_speed": round(data["wind"]["speed"], 1),
-                    "clouds": data["clouds"]["all"],
-                    "visibility": data.get("visibility", 0) // 1000,  # Convert to km
-                    "timestamp": datetime.utcnow().isoformat()
+            response = await self._client.get(
+                "/weather",
+                params={
+                    "q": city,
+                    "appid": self.api_key,
+                    "units": "metric"
                 }
-                
-                # Cache the result
-                self.cache[cache_key] = (weather_data, datetime.utcnow())
-                logger.info(f"✅ Weather fetched for {city}")
-                
-                return weather_data
-                
+            )
+            response.raise_for_status()
+            data = response.json()
+            
+            # Format response
+            temp, feels_like, temp_min, temp_max, humidity, pressure = _MAIN_FIELDS(data["main"])
+            condition = data["weather"][0]
+            weather_data = {
+                "city": data["name"],
+                "country": data["sys"]["country"],
+                "temperature": round(temp, 1),
+                "feels_like": round(feels_like, 1),
+                "temp_min": round(temp_min, 1),
+                "temp_max": round(temp_max, 1),
+                "humidity": humidity,
+                "pressure": pressure,
+                "description": condition["description"].capitalize(),
+                "icon": condition["icon"],
+                "wind_speed": round(data["wind"]["speed"], 1),
+                "clouds": data["clouds"]["all"],
+                "visibility": data.get("visibility", 0) // 1000,  # Convert to km
+                "timestamp": datetime.utcnow().isoformat()
+            }
+            
+            # Cache the result
+            self.cache[cache_key] = weather_data
+            logger.info(f"✅ Weather fetched for {city}")
+            
+            return weather_data
+            
         except httpx.HTTPStatusError as e:
             if e.response.status_code == 404:
                 logger.error(f"❌ City not found: {city}")
@@ -130,60 +164,61 @@ class WeatherService:
         cache_key = self._get_cache_key(city, f"forecast_{days}")
         
         # Check cache
-        if cache_key in self.cache:
-            cached_data, timestamp = self.cache[cache_key]
-            if self._is_cache_valid(timestamp):
-                logger.info(f"📦 Forecast cache hit for {city}")
-                return cached_data
+        cached_data = self.cache.get(cache_key)
+        if cached_data is not None:
+            logger.info(f"📦 Forecast cache hit for {city}")
+            return cached_data
         
+        return await self._single_flight(cache_key, lambda: self._fetch_forecast(city, days, cache_key))
+    
+    async def _fetch_forecast(self, city: str, days: int, cache_key: str) -> Optional[Dict[str, Any]]:
+        """Fetch the forecast from the API and cache it"""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.BASE_URL}/forecast",
-                    params={
-                        "q": city,
-                        "appid": self.api_key,
-                        "units": "metric",
-                        "cnt": days * 8  # 8 forecasts per day (3-hour intervals)
-                    },
-                    timeout=10.0
-                )
-                response.raise_for_status()
-                data = response.json()
-                
-                # Group forecasts by day
-                daily_forecasts = []
-                current_day = None
-                day_data = []
-                
-                for item in data["list"]:
-                    forecast_date = datetime.fromtimestamp(item["dt"]).date()
-                    
-                    if current_day != forecast_date:
-                        if day_data:
-                            daily_forecasts.append(self._aggregate_day_forecast(day_data))
-                        current_day = forecast_date
-                        day_data = [item]
-                    else:
-                        day_data.append(item)
-                
-                # Add last day
-                if day_data:
-                    daily_forecasts.append(self._aggregate_day_forecast(day_data))
-                
-                forecast_data = {
-                    "city": data["city"]["name"],
-                    "country": data["city"]["country"],
-                    "forecasts": daily_forecasts[:days],
-                    "timestamp": datetime.utcnow().isoformat()
+            response = await self._client.get(
+                "/forecast",
+                params={
+                    "q": city,
+                    "appid": self.api_key,
+                    "units": "metric",
+                    "cnt": days * 8  # 8 forecasts per day (3-hour intervals)
                 }
+            )
+            response.raise_for_status()
+            data = response.json()
+            
+            # Group forecasts by day
+            daily_forecasts = []
+            current_day = None
+            day_data = []
+            
+            for item in data["list"]:
+                forecast_date = datetime.fromtimestamp(item["dt"]).date()
                 
-                # Cache the result
-                self.cache[cache_key] = (forecast_data, datetime.utcnow())
-                logger.info(f"✅ Forecast fetched for {city} ({days} days)")
-                
-                return forecast_data
-                
+                if current_day != forecast_date:
+                    if day_data:
+                        daily_forecasts.append(self._aggregate_day_forecast(day_data))
+                    current_day = forecast_date
+                    day_data = [item]
+                else:
+                    day_data.append(item)
+            
+            # Add last day
+            if day_data:
+                daily_forecasts.append(self._aggregate_day_forecast(day_data))
+            
+            forecast_data = {
+                "city": data["city"]["name"],
+                "country": data["city"]["country"],
+                "forecasts": daily_forecasts[:days],
+                "timestamp": datetime.utcnow().isoformat()
+            }
+            
+            # Cache the result
+            self.cache[cache_key] = forecast_data
+            logger.info(f"✅ Forecast fetched for {city} ({days} days)")
+            
+            return forecast_data
+            
         except httpx.HTTPStatusError as e:
             if e.response.status_code == 404:
                 logger.error(f"❌ City not found: {city}")
@@ -206,23 +241,35 @@ class WeatherService:
         if not day_data:
             return {}
         
-        temps = [item["main"]["temp"] for item in day_data]
-        descriptions = [item["weather"][0]["description"] for item in day_data]
+        # One pass over the 3-hour slots
+        temps = []
+        humidity_total = wind_total = 0
+        max_pop = 0
+        descriptions = Counter()
+        for item in day_data:
+            temps.append(item["main"]["temp"])
+            humidity_total += item["main"]["humidity"]
+            wind_total += item["wind"]["speed"]
+            max_pop = max(max_pop, item.get("pop", 0))
+            descriptions[item["weather"][0]["description"]] += 1
+        
+        count = len(day_data)
+        day = datetime.fromtimestamp(day_data[0]["dt"])
         
         # Most common weather description
-        description = max(set(descriptions), key=descriptions.count)
+        description = descriptions.most_common(1)[0][0]
         
         return {
-            "date": datetime.fromtimestamp(day_data[0]["dt"]).strftime("%Y-%m-%d"),
-            "day_name": datetime.fromtimestamp(day_data[0]["dt"]).strftime("%A"),
+            "date": day.strftime("%Y-%m-%d"),
+            "day_name": day.strftime("%A"),
             "temp_min": round(min(temps), 1),
             "temp_max": round(max(temps), 1),
-            "temp_avg": round(sum(temps) / len(temps), 1),
+            "temp_avg": round(sum(temps) / count, 1),
             "description": description.capitalize(),
-            "icon": day_data[len(day_data)//2]["weather"][0]["icon"],  # Midday icon
-            "humidity": round(sum(item["main"]["humidity"] for item in day_data) / len(day_data)),
-            "wind_speed": round(sum(item["wind"]["speed"] for item in day_data) / len(day_data), 1),
-            "pop": round(max(item.get("pop", 0) for item in day_data) * 100)  # Probability of precipitation
+            "icon": day_data[count//2]["weather"][0]["icon"],  # Midday icon
+            "humidity": round(humidity_total / count),
+            "wind_speed": round(wind_total / count, 1),
+            "pop": round(max_pop * 100)  # Probability of precipitation
         }
     
     async def get_weather_summary(self, city: str) -> str:
@@ -254,15 +301,10 @@ class WeatherService:
     
     def get_cache_stats(self) -> Dict[str, Any]:
         """Get cache statistics"""
-        valid_entries = sum(
-            1 for _, (_, timestamp) in self.cache.items()
-            if self._is_cache_valid(timestamp)
-        )
-        
+        # TTLCache drops expired entries itself, so every entry is valid
         return {
             "total_entries": len(self.cache),
-            "valid_entries": valid_entries,
-            "expired_entries": len(self.cache) - valid_entries
+            "maxsize": self.cache.maxsize
         }
 
 
@@ -1,15 +1,107 @@
-from typing import Dict, Any, Optional
+from typing import Dict, List, Mapping, Optional
+from types import MappingProxyType
+from functools import lru_cache
+from collections import defaultdict
 import re
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta, timezone
 
+_UTC = timezone.utc
 
+_WS_RE = re.compile(r'\s+')
+
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
+_CURRENCY_SYMBOLS = {
+    "USD": "$",
+    "EUR": "€",
+    "GBP": "£",
+    "JPY": "¥",
+    "INR": "₹"
+}
+
+_INTEREST_CATEGORIES = {
+    "adventure": ["hiking", "trekking", "climbing", "adventure", "outdoor", "safari", "camping"],
+    "culture": ["culture", "history", "museums", "art", "architecture", "heritage", "temples"],
+    "food": ["food", "cuisine", "dining", "culinary", "wine", "gastronomy"],
+    "beach": ["beach", "coastal", "ocean", "seaside", "tropical", "island"],
+    "nature": ["nature", "wildlife", "scenery", "landscapes", "parks", "mountains"],
+    "city": ["city", "urban", "shopping", "nightlife", "entertainment", "modern"],
+    "relaxation": ["relaxation", "spa", "wellness", "yoga", "meditation", "retreat"]
+}
+
+# Marks the end of a keyword in the trie; maps to that keyword's category
+_TRIE_END = ""
+
+
+def _build_keyword_trie(categories: Dict[str, List[str]]) -> dict:
+    """Build a character trie over the category keywords"""
+    trie: dict = {}
+    for category, keywords in categories.items():
+        for keyword in keywords:
+            node = trie
+            for char in keyword:
+                node = node.setdefault(char, {})
+            node[_TRIE_END] = category
+    return trie
+
+
+_KEYWORD_TRIE = _build_keyword_trie(_INTEREST_CATEGORIES)
+
+# Shared read-only budget entries returned by parse_budget_level
+_BUDGET_INFO = {
+    level: MappingProxyType(info)
+    for level, info in {
+        "low": {
+            "daily_range": "$30-$70",
+            "accommodation": "Hostels, budget hotels",
+            "food": "Street food, local eateries",
+            "transport": "Public transport"
+        },
+        "moderate": {
+            "daily_range": "$70-$150",
+            "accommodation": "3-star hotels, Airbnb",
+            "food": "Mid-range restaurants",
+            "transport": "Mix of public and private"
+        },
+        "high": {
+            "daily_range": "$150-$300",
+            "accommodation": "4-star hotels, nice Airbnb",
+            "food": "Good restaurants, occasional fine dining",
+            "transport": "Private transport, some taxis"
+        },
+        "luxury": {
+            "daily_range": "$300+",
+            "accommodation": "5-star hotels, luxury resorts",
+            "food": "Fine dining, michelin restaurants",
+            "transport": "Private cars, first class"
+        }
+    }.items()
+}
+
+# (min, max) spend per traveler per day in USD
+_DAILY_COSTS = {
+    "low": (30, 70),
+    "moderate": (70, 150),
+    "high": (150, 300),
+    "luxury": (300, 500)
+}
+
+# Season by month number; index 0 is unused
+_SEASONS = (
+    None,
+    "Winter", "Winter", "Spring", "Spring", "Spring", "Summer",
+    "Summer", "Summer", "Fall", "Fall", "Fall", "Winter"
+)
+
+
+@lru_cache(maxsize=4096)
 def extract_city_from_destination(destination: str) -> str:
     """
     Extract city name from destination string
     
     Example: "Paris, France" -> "Paris"
     """
-    return destination.split(',')[0].strip()
+    return destination.partition(',')[0].strip()
 
 
 def format_currency(amount: float, currency: str = "USD") -> str:
@@ -23,16 +115,26 @@ def format_currency(amount: float, currency: str = "USD") -> str:
     Returns:
         Formatted currency string
     """
-    symbols = {
-        "USD": "$",
-        "EUR": "€",
-        "GBP": "£",
-        "JPY": "¥",
-        "INR": "₹"
-    }
-    
-    symbol = symbols.get(currency, "$")
-    return f"{symbol}{amount:,.2f}"
+    return f"{_CURRENCY_SYMBOLS.get(currency, '$')}{amount:,.2f}"
+
+
+@lru_cache(maxsize=2048)
+def _parse_ymd(value: str) -> datetime:
+    """Parse a YYYY-MM-DD string; repeated dates are served from the cache"""
+    # Fixed-width fast path; anything unusual goes through strptime
+    if (
+        len(value) == 10 and value[4] == '-' and value[7] == '-'
+        and value.isascii() and value[:4].isdigit()
+        and value[5:7].isdigit() and value[8:].isdigit()
+    ):
+        return datetime(int(value[:4]), int(value[5:7]), int(value[8:]))
+    return datetime.strptime(value, "%Y-%m-%d")
+
+
+@lru_cache(maxsize=4096)
+def _fmt_date(day: date, fmt: str) -> str:
+    """strftime with the result cached per (date, format)"""
+    return day.strftime(fmt)
 
 
 def calculate_date_range(start_date: str, days: int) -> Dict[str, str]:
@@ -47,20 +149,20 @@ def calculate_date_range(start_date: str, days: int) -> Dict[str, str]:
         Dictionary with start_date and end_date
     """
     try:
-        start = datetime.strptime(start_date, "%Y-%m-%d")
+        start = _parse_ymd(start_date).date()
         end = start + timedelta(days=days - 1)
         
         return {
-            "start_date": start.strftime("%Y-%m-%d"),
-            "end_date": end.strftime("%Y-%m-%d"),
-            "start_date_formatted": start.strftime("%B %d, %Y"),
-            "end_date_formatted": end.strftime("%B %d, %Y")
+            "start_date": _fmt_date(start, "%Y-%m-%d"),
+            "end_date": _fmt_date(end, "%Y-%m-%d"),
+            "start_date_formatted": _fmt_date(start, "%B %d, %Y"),
+            "end_date_formatted": _fmt_date(end, "%B %d, %Y")
         }
     except ValueError:
         return {}
 
 
-def parse_budget_level(budget: str) -> Dict[str, Any]:
+def parse_budget_level(budget: str) -> Mapping[str, str]:
     """
     Get budget information based on level
     
@@ -68,36 +170,9 @@ def parse_budget_level(budget: str) -> Dict[str, Any]:
         budget: Budget level (low, moderate, high, luxury)
         
     Returns:
-        Dictionary with budget details
+        Read-only mapping with budget details
     """
-    budget_info = {
-        "low": {
-            "daily_range": "$30-$70",
-            "accommodation": "Hostels, budget hotels",
-            "food": "Street food, local eateries",
-            "transport": "Public transport"
-        },
-        "moderate": {
-            "daily_range": "$70-$150",
-            "accommodation": "3-star hotels, Airbnb",
-            "food": "Mid-range restaurants",
-            "transport": "Mix of public and private"
-        },
-        "high": {
-            "daily_range": "$150-$300",
-            "accommodation": "4-star hotels, nice Airbnb",
-            "food": "Good restaurants, occasional fine dining",
-            "transport": "Private transport, some taxis"
-        },
-        "luxury": {
-            "daily_range": "$300+",
-            "accommodation": "5-star hotels, luxury resorts",
-            "food": "Fine dining, michelin restaurants",
-            "transport": "Private cars, first class"
-        }
-    }
-    
-    return budget_info.get(budget.lower(), budget_info["moderate"])
+    return _BUDGET_INFO.get(budget.lower(), _BUDGET_INFO["moderate"])
 
 
 def validate_email(email: str) -> bool:
@@ -110,10 +185,30 @@ def validate_email(email: str) -> bool:
     Returns:
         True if valid, False otherwise
     """
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return bool(re.match(pattern, email))
+    # Cheap string checks reject most malformed input before the regex runs
+    if not email or email.count('@') != 1:
+        return False
+    local, _, domain = email.partition('@')
+    if not local or len(domain) < 4 or '.' not in domain:
+        return False
+    return _EMAIL_RE.match(email) is not None
+
 
+def validate_emails(emails: List[str]) -> List[bool]:
+    """
+    Validate a batch of email addresses
+    
+    Args:
+        emails: Email addresses to validate
+        
+    Returns:
+        True/False for each address, in order
+    """
+    validate = validate_email
+    return [validate(email) for email in emails]
 
+
+@lru_cache(maxsize=4096)
 def sanitize_destination_name(destination: str) -> str:
     """
     Sanitize and format destination name
@@ -124,49 +219,39 @@ def sanitize_destination_name(destination: str) -> str:
     Returns:
         Cleaned destination name
     """
-    # Remove extra spaces
-    destination = " ".join(destination.split())
-    
-    # Capitalize each word
-    destination = destination.title()
-    
-    return destination
+    # Collapse runs of whitespace, trim, and capitalize each word
+    return _WS_RE.sub(" ", destination).strip().title()
 
 
-def get_season_from_month(month: int) -> str:
+def sanitize_destinations(destinations: List[str]) -> List[str]:
     """
-    Get season from month number
+    Sanitize a batch of destination names
     
     Args:
-        month: Month number (1-12)
+        destinations: Raw destination names
         
     Returns:
-        Season name
+        Cleaned destination names, in order
     """
-    seasons = {
-        (12, 1, 2): "Winter",
-        (3, 4, 5): "Spring",
-        (6, 7, 8): "Summer",
-        (9, 10, 11): "Fall"
-    }
-    
-    for months, season in seasons.items():
-        if month in months:
-            return season
-    
-    return "Unknown"
+    sanitize = sanitize_destination_name
+    return [sanitize(destination) for destination in destinations]
 
 
-def format_duration(days: int) -> str:
+def get_season_from_month(month: int) -> str:
     """
-    Format duration in human-readable format
+    Get season from month number
     
     Args:
-        days: Number of days
+        month: Month number (1-12)
         
     Returns:
-        Formatted duration string
+        Season name
     """
+    return _SEASONS[month] if 1 <= month <= 12 else "Unknown"
+
+
+def _compute_duration(days: int) -> str:
+    """Build the human-readable duration string for format_duration"""
     if days == 1:
         return "1 day"
     elif days < 7:
@@ -186,6 +271,25 @@ def format_duration(days: int) -> str:
             return f"{weeks} weeks and {remaining_days} days"
 
 
+# Precomputed strings for common trip lengths
+_DURATION_STRINGS = tuple(_compute_duration(days) for days in range(31))
+
+
+def format_duration(days: int) -> str:
+    """
+    Format duration in human-readable format
+    
+    Args:
+        days: Number of days
+        
+    Returns:
+        Formatted duration string
+    """
+    if 0 <= days < len(_DURATION_STRINGS):
+        return _DURATION_STRINGS[days]
+    return _compute_duration(days)
+
+
 def truncate_text(text: str, max_length: int = 100, suffix: str = "...") -> str:
     """
     Truncate text to maximum length
@@ -201,7 +305,40 @@ def truncate_text(text: str, max_length: int = 100, suffix: str = "...") -> str:
     if len(text) <= max_length:
         return text
     
-    return text[:max_length - len(suffix)].strip() + suffix
+    # Find the trimmed cut bounds first so only one slice is made
+    end = max_length - len(suffix)
+    if end < 0:
+        end = max(len(text) + end, 0)
+    while end and text[end - 1].isspace():
+        end -= 1
+    start = 0
+    while start < end and text[start].isspace():
+        start += 1
+    return text[start:end] + suffix
+
+
+def _match_keyword(text: str) -> Optional[str]:
+    """Walk the keyword trie; return the category if text is a keyword"""
+    node = _KEYWORD_TRIE
+    for char in text:
+        node = node.get(char)
+        if node is None:
+            return None
+    return node.get(_TRIE_END)
+
+
+def _tag_interest(interest: str) -> str:
+    """Category for one interest; phrases fall back to their first keyword word"""
+    text = interest.lower()
+    category = _match_keyword(text)
+    if category is None:
+        words = text.split()
+        if len(words) > 1:
+            for word in words:
+                category = _match_keyword(word)
+                if category is not None:
+                    break
+    return category or "other"
 
 
 def parse_interests_tags(interests: list) -> Dict[str, list]:
@@ -214,36 +351,29 @@ def parse_interests_tags(interests: list) -> Dict[str, list]:
     Returns:
         Dictionary with categorized interests
     """
-    categories = {
-        "adventure": ["hiking", "trekking", "climbing", "adventure", "outdoor", "safari", "camping"],
-        "culture": ["culture", "history", "museums", "art", "architecture", "heritage", "temples"],
-        "food": ["food", "cuisine", "dining", "culinary", "wine", "gastronomy"],
-        "beach": ["beach", "coastal", "ocean", "seaside", "tropical", "island"],
-        "nature": ["nature", "wildlife", "scenery", "landscapes", "parks", "mountains"],
-        "city": ["city", "urban", "shopping", "nightlife", "entertainment", "modern"],
-        "relaxation": ["relaxation", "spa", "wellness", "yoga", "meditation", "retreat"]
-    }
+    result = defaultdict(list)
+    for interest in interests:
+        result[_tag_interest(interest)].append(interest)
     
-    result = {category: [] for category in categories.keys()}
-    result["other"] = []
+    # Only categories with at least one interest were created
+    return dict(result)
+
+
+def parse_interests_tags_batch(interest_lists: List[list]) -> List[Dict[str, list]]:
+    """
+    Categorize several interest lists
     
-    for interest in interests:
-        interest_lower = interest.lower()
-        categorized = False
-        
-        for category, keywords in categories.items():
-            if interest_lower in keywords:
-                result[category].append(interest)
-                categorized = True
-                break
+    Args:
+        interest_lists: One list of interest tags per trip
         
-        if not categorized:
-            result["other"].append(interest)
-    
-    # Remove empty categories
-    return {k: v for k, v in result.items() if v}
+    Returns:
+        Categorized interests for each list, in order
+    """
+    parse = parse_interests_tags
+    return [parse(interests) for interests in interest_lists]
 
 
+@lru_cache(maxsize=256)
 def calculate_estimated_cost(days: int, budget: str, travelers: int = 1) -> str:
     """
     Calculate estimated total cost for trip
@@ -256,14 +386,7 @@ def calculate_estimated_cost(days: int, budget: str, travelers: int = 1) -> str:
     Returns:
         Estimated cost range as string
     """
-    daily_costs = {
-        "low": (30, 70),
-        "moderate": (70, 150),
-        "high": (150, 300),
-        "luxury": (300, 500)
-    }
-    
-    min_daily, max_daily = daily_costs.get(budget.lower(), (70, 150))
+    min_daily, max_daily = _DAILY_COSTS.get(budget.lower(), _DAILY_COSTS["moderate"])
     
     min_cost = min_daily * days * travelers
     max_cost = max_daily * days * travelers
@@ -278,23 +401,39 @@ def get_current_timestamp() -> str:
     Returns:
         ISO formatted timestamp string
     """
-    return datetime.utcnow().isoformat()
+    return datetime.now(_UTC).isoformat()
 
 
-def days_until_date(target_date: str) -> Optional[int]:
+def days_until_date(target_date: str, now: Optional[datetime] = None) -> Optional[int]:
     """
     Calculate days until target date
     
     Args:
         target_date: Date in YYYY-MM-DD format
+        now: Reference time (defaults to the current local time)
         
     Returns:
         Number of days until date, or None if invalid
     """
     try:
-        target = datetime.strptime(target_date, "%Y-%m-%d")
-        today = datetime.now()
-        delta = target - today
+        target = _parse_ymd(target_date)
+        if now is None:
+            now = datetime.now()
+        delta = target - now
         return delta.days
     except ValueError:
-        return None
\ No newline at end of file
+        return None
+
+
+def days_until_dates(target_dates: List[str]) -> List[Optional[int]]:
+    """
+    Calculate days until each target date, reading the clock once
+    
+    Args:
+        target_dates: Dates in YYYY-MM-DD format
+        
+    Returns:
+        Days until each date, or None for invalid entries
+    """
+    now = datetime.now()
+    return [days_until_date(target_date, now) for target_date in target_dates]
@@ -2,41 +2,55 @@ import logging
 import sys
 from app.config import settings
 
+# Third-party loggers that are too chatty below WARNING
+_NOISY = (
+    "httpx",
+    "httpcore",
+    "urllib3",
+    "pymongo",
+    "pymongo.connection",
+    "pymongo.topology",
+    "pymongo.serverSelection",
+    "pymongo.command",
+)
+
+_FORMATTER = logging.Formatter(
+    '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+
+# Set once setup_logging has run, so repeated calls don't add handlers
+_CONFIGURED = False
+
 def setup_logging():
-    """Configure application logging"""
+    """Configure application logging (safe to call more than once)"""
+    global _CONFIGURED
+    if _CONFIGURED:
+        return
+    _CONFIGURED = True
     
     # Set logging level based on debug mode
-    level = logging.DEBUG if settings.DEBUG else logging.INFO
+    level = logging.DEBUG if settings.DEBUG else settings.LOG_LEVEL
     
-    # Create formatter
-    formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
+    # The format doesn't use caller, thread or process fields, so skip
+    # collecting them for every record
+    logging._srcfile = None
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
     
-    # Console handler
+    # Console handler on the root logger
     console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setFormatter(formatter)
-    
-    # Root logger configuration
-    root_logger = logging.getLogger()
-    root_logger.setLevel(level)
-    root_logger.addHandler(console_handler)
+    console_handler.setFormatter(_FORMATTER)
+    logging.basicConfig(handlers=[console_handler])
+    logging.getLogger().setLevel(level)
     
     # Suppress noisy loggers
-    logging.getLogger("httpx").setLevel(logging.WARNING)
-    logging.getLogger("httpcore").setLevel(logging.WARNING)
-    logging.getLogger("urllib3").setLevel(logging.WARNING)
-    
-    # ✅ ADD THESE LINES TO SUPPRESS PYMONGO DEBUG LOGS
-    logging.getLogger("pymongo").setLevel(logging.WARNING)
-    logging.getLogger("pymongo.connection").setLevel(logging.WARNING)
-    logging.getLogger("pymongo.topology").setLevel(logging.WARNING)
-    logging.getLogger("pymongo.serverSelection").setLevel(logging.WARNING)
-    logging.getLogger("pymongo.command").setLevel(logging.WARNING)
+    for name in _NOISY:
+        logging.getLogger(name).setLevel(logging.WARNING)
     
     logging.info("✅ Logging configured")
 
 def get_logger(name: str) -> logging.Logger:
     """Get a logger instance"""
-    return logging.getLogger(name)
\ No newline at end of file
+    return logging.getLogger(name)
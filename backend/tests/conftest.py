@@ -0,0 +1,4 @@
+import os
+
+# AIService refuses to start without a key; tests never reach the API
+os.environ.setdefault("LLAMA_API_KEY", "test")
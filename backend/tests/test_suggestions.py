@@ -0,0 +1,290 @@
+import asyncio
+from datetime import datetime, timezone
+
+import orjson
+import pytest
+from bson import ObjectId
+from fastapi import HTTPException
+from pydantic import ValidationError
+
+from app.models.suggestion_model import SuggestedTrip, SUGGESTION_SCHEMA_VERSION
+from app.routes import suggestions as routes
+
+
+# A normalized document as stored by prepare_for_insert, trimmed to _PROJECTION
+DB_DOC = {
+    "_id": ObjectId("65f000000000000000000001"),
+    "destination": "Bali",
+    "country": "Indonesia",
+    "continent": "Asia",
+    "title": "Tropical Paradise Adventure",
+    "description": "Experience beaches, temples, and culture",
+    "duration": "7-10 days",
+    "duration_days": 7,
+    "highlights": ["Beaches", "Temples", "Rice Terraces"],
+    "best_time_to_visit": "April to October",
+    "best_months": ["Apr", "May", "Jun"],
+    "category": ["beach", "culture"],
+    "budget": "moderate",
+    "estimated_cost": "$800-$1500",
+    "image_url": None,
+    "rating": 4.8,
+    "popular_activities": ["Surfing"],
+    "travel_tips": ["Carry cash"],
+    "weather_info": None,
+    "created_at": datetime(2024, 3, 1, tzinfo=timezone.utc),
+    "updated_at": datetime(2024, 3, 1, tzinfo=timezone.utc),
+    "schema_version": SUGGESTION_SCHEMA_VERSION,
+}
+
+AI_SUGGESTION = {
+    key: value for key, value in DB_DOC.items()
+    if key not in ("_id", "created_at", "updated_at", "schema_version")
+}
+
+
+@pytest.fixture(autouse=True)
+def clear_trip_cache():
+    routes._trip_cache.clear()
+    yield
+    routes._trip_cache.clear()
+
+
+def test_construct_matches_validate_for_db_document():
+    doc = DB_DOC | {"_id": str(DB_DOC["_id"])}
+
+    constructed = SuggestedTrip.model_construct(**doc)
+    validated = SuggestedTrip.model_validate(doc)
+
+    assert constructed.model_dump(by_alias=True) == validated.model_dump(by_alias=True)
+
+
+def test_cached_trip_matches_validate_for_current_schema():
+    trip = routes.cached_trip(dict(DB_DOC))
+
+    expected = SuggestedTrip.model_validate(DB_DOC | {"_id": str(DB_DOC["_id"])})
+    assert trip.model_dump(by_alias=True) == expected.model_dump(by_alias=True)
+
+
+def test_cached_trip_validates_legacy_rows():
+    legacy = {k: v for k, v in DB_DOC.items() if k not in ("country", "schema_version")}
+
+    with pytest.raises(ValidationError):
+        routes.cached_trip(legacy)
+
+
+def test_prepare_for_insert_skips_invalid_suggestions():
+    missing_fields = {k: v for k, v in AI_SUGGESTION.items() if k not in ("country", "title")}
+    bad_rating = AI_SUGGESTION | {"rating": 9}
+
+    docs = routes.prepare_for_insert(
+        [dict(AI_SUGGESTION), missing_fields, bad_rating, dict(AI_SUGGESTION)],
+        featured=1
+    )
+
+    assert len(docs) == 2
+    assert [doc["is_featured"] for doc in docs] == [True, False]
+    for doc in docs:
+        assert doc["schema_version"] == SUGGESTION_SCHEMA_VERSION
+        assert doc["created_at"] == doc["updated_at"]
+
+
+def test_prepare_suggestion_normalizes_before_validating():
+    raw = AI_SUGGESTION | {"category": "beach, culture", "duration_days": 6.6, "rating": "4.5"}
+
+    doc = routes.prepare_suggestion(raw, datetime.now(timezone.utc))
+
+    assert doc["category"] == ["beach", "culture"]
+    assert doc["duration_days"] == 7
+    assert doc["rating"] == 4.5
+
+
+def test_stampable_expr_covers_every_trip_field():
+    checked = (
+        set(routes._REQUIRED_STR_FIELDS)
+        | set(routes._OPTIONAL_STR_FIELDS)
+        | set(routes._ARRAY_FIELDS)
+        | {"duration_days", "created_at", "rating"}
+    )
+    fields = {field.alias or name for name, field in SuggestedTrip.model_fields.items()}
+
+    assert fields - {"_id"} == checked
+
+
+class FakeCursor:
+    def __init__(self, docs):
+        self._docs = docs
+
+    def batch_size(self, _):
+        return self
+
+    def __aiter__(self):
+        return self._iter()
+
+    async def _iter(self):
+        for doc in self._docs:
+            yield doc
+
+
+class FakeCollection:
+    def __init__(self, docs):
+        self.docs = docs
+        self.updates = {}
+
+    def find(self, _query):
+        return FakeCursor([dict(doc) for doc in self.docs])
+
+    async def bulk_write(self, ops, ordered=True):
+        for op in ops:
+            self.updates[op._filter["_id"]] = op._doc["$set"]
+
+
+def test_client_side_migration_normalizes_rating_and_stamps_valid_rows():
+    legacy = {k: v for k, v in DB_DOC.items() if k != "schema_version"} | {"rating": "4.5"}
+    invalid = legacy | {"_id": ObjectId("65f000000000000000000002"), "rating": 4}
+    del invalid["country"]
+    collection = FakeCollection([legacy, invalid])
+
+    updated, total = asyncio.run(routes.migrate_string_to_array_client_side(collection))
+
+    assert (updated, total) == (2, 2)
+    assert collection.updates[legacy["_id"]] == {
+        "rating": 4.5,
+        "schema_version": SUGGESTION_SCHEMA_VERSION
+    }
+    # Int ratings are rewritten as floats; rows that fail validation stay legacy
+    assert collection.updates[invalid["_id"]] == {"rating": 4.0}
+
+
+def test_client_side_migration_writes_missing_array_fields_before_stamping():
+    legacy = {
+        k: v for k, v in DB_DOC.items()
+        if k not in ("schema_version", "highlights", "travel_tips")
+    }
+    collection = FakeCollection([legacy])
+
+    asyncio.run(routes.migrate_string_to_array_client_side(collection))
+
+    update = collection.updates[legacy["_id"]]
+    assert update == {
+        "highlights": [],
+        "travel_tips": [],
+        "schema_version": SUGGESTION_SCHEMA_VERSION
+    }
+    # The stored row is what trusted reads construct from
+    stored = legacy | update
+    trip = routes.cached_trip(dict(stored))
+    assert trip.model_dump(by_alias=True) == SuggestedTrip.model_validate(
+        stored | {"_id": str(stored["_id"])}
+    ).model_dump(by_alias=True)
+
+
+def test_client_side_migration_uses_strict_types_for_stamping():
+    # Pydantic would coerce an ISO string created_at, but the server-side
+    # $expr requires a BSON date, so neither path may stamp this row
+    legacy = {k: v for k, v in DB_DOC.items() if k != "schema_version"} | {
+        "created_at": "2024-03-01T00:00:00+00:00"
+    }
+    collection = FakeCollection([legacy])
+
+    updated, _ = asyncio.run(routes.migrate_string_to_array_client_side(collection))
+
+    assert updated == 0
+    assert routes.is_stampable(DB_DOC)
+    assert not routes.is_stampable(legacy)
+    assert not routes.is_stampable(DB_DOC | {"rating": 4})
+    assert not routes.is_stampable(DB_DOC | {"created_at": None})
+    assert routes.is_stampable({k: v for k, v in DB_DOC.items() if k != "created_at"})
+
+
+def test_keyset_after_reaches_unrated_documents():
+    oid = ObjectId("65f000000000000000000001")
+
+    rated = routes.keyset_after(4.5, oid)
+    assert {"rating": None} in rated["$or"]
+
+    assert routes.keyset_after(None, oid) == {"rating": None, "_id": {"$gt": oid}}
+
+
+@pytest.mark.parametrize("cursor", [
+    {"after_rating": 4.5},
+    {"after_id": "65f000000000000000000001"},
+    {"after_id": "65f000000000000000000001", "after_rating": 4.5, "after_unrated": True},
+])
+def test_half_specified_cursor_is_rejected(cursor):
+    params = dict(
+        category=None, budget=None, duration_min=None, duration_max=None,
+        continent=None, featured=False, limit=10, skip=0, after_rating=None,
+        after_id=None, after_unrated=False, suggestion_id=None
+    ) | cursor
+
+    with pytest.raises(HTTPException) as excinfo:
+        asyncio.run(routes.get_suggestions(**params))
+
+    assert excinfo.value.status_code == 400
+
+
+def test_stream_saves_sent_suggestions_when_client_disconnects(monkeypatch):
+    from app.services.ai_service import ai_service
+
+    async def fake_stream(**_):
+        for _ in range(3):
+            yield dict(AI_SUGGESTION)
+
+    inserted = []
+
+    class Collection:
+        async def insert_many(self, docs):
+            inserted.extend(docs)
+
+    monkeypatch.setattr(ai_service, "generate_suggestions_stream", fake_stream)
+    monkeypatch.setattr(routes, "get_collection", lambda _: Collection())
+
+    async def read_one_then_disconnect():
+        stream = routes.stream_ai_suggestions(None, None, None, 3, save_to_db=True)
+        first = await stream.__anext__()
+        await stream.aclose()
+        await asyncio.gather(*routes._background_writes)
+        return first
+
+    first = asyncio.run(read_one_then_disconnect())
+
+    assert len(inserted) == 1
+    assert str(inserted[0]["_id"]).encode() in first
+
+
+def test_saved_ai_suggestions_are_validated_once(monkeypatch):
+    from app.services.ai_service import ai_service
+
+    async def fake_generate(**_):
+        return [dict(AI_SUGGESTION), dict(AI_SUGGESTION)]
+
+    class Collection:
+        async def insert_many(self, docs):
+            ids = [ObjectId() for _ in docs]
+            for doc, oid in zip(docs, ids):
+                doc["_id"] = oid
+            return type("Result", (), {"inserted_ids": ids})
+
+    validations = []
+    original_init = SuggestedTrip.__init__
+
+    def counting_init(self, **data):
+        validations.append(data)
+        original_init(self, **data)
+
+    monkeypatch.setattr(ai_service, "generate_suggestions", fake_generate)
+    monkeypatch.setattr(routes, "get_collection", lambda _: Collection())
+    monkeypatch.setattr(routes, "mark_seeded", lambda: None)
+    monkeypatch.setattr(SuggestedTrip, "__init__", counting_init)
+
+    response = asyncio.run(routes.generate_ai_suggestions(
+        category=None, budget=None, continent=None, destination=None,
+        count=2, save_to_db=True, stream=False
+    ))
+
+    assert validations == []
+    body = orjson.loads(response.body)
+    assert len(body) == 2
+    assert body[0]["destination"] == "Bali"
+    assert ObjectId.is_valid(body[0]["_id"])
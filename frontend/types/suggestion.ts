@@ -27,6 +27,7 @@ export interface SuggestionsResponse {
   total: number;
   suggestions: SuggestedTrip[];
   filters_applied?: Record<string, any>;
+  next_cursor?: { after_rating: number | null; after_id: string; after_unrated: boolean } | null;
 }
 
 export interface SuggestionFilters {